@@ -1,3 +1,8 @@
+from bisect import bisect_left, bisect_right, insort
+import random
+import sys
+import time
+
 def insertion_sort_desc(arr):
     # Sorts an array in monotonically decreasing order using insertion sort.
     for i in range(1, len(arr)):
@@ -10,6 +15,199 @@ def insertion_sort_desc(arr):
         arr[j + 1] = key
     return arr
 
+class SortedList:
+    # Sorted container for streaming inserts, descending by default (like insertion_sort_desc).
+    # Items live in ascending sublists of about `load` elements, with `maxes` holding each
+    # sublist's last item. An insert is a binary search over maxes, then a binary
+    # insertion into one short sublist, where list.insert moves the tail as one block
+    # instead of shifting element by element. Sublists split at 2 * load and merge below
+    # load / 2. A Fenwick tree over sublist lengths maps positions to sublists in O(log n).
+
+    def __init__(self, iterable=(), reverse=True, load=1000):
+        self.reverse = reverse
+        self.load = load
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+        self._tree = None  # Fenwick tree of sublist lengths; None = rebuild on next positional query
+        self.add_many(iterable)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        if self.reverse:
+            for sub in reversed(self._lists):
+                yield from reversed(sub)
+        else:
+            for sub in self._lists:
+                yield from sub
+
+    def __contains__(self, value):
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sub = self._lists[pos]
+        idx = bisect_left(sub, value)
+        return sub[idx] == value
+
+    def __repr__(self):
+        return f"SortedList({list(self)!r}, reverse={self.reverse})"
+
+    def add(self, value):
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._tree = None
+        else:
+            pos = bisect_right(self._maxes, value)
+            if pos == len(self._maxes):
+                pos -= 1
+                self._lists[pos].append(value)
+                self._maxes[pos] = value
+            else:
+                insort(self._lists[pos], value)
+            if len(self._lists[pos]) > 2 * self.load:
+                self._split(pos)
+            elif self._tree is not None:
+                self._tree_update(pos, 1)
+        self._len += 1
+
+    def add_many(self, values):
+        # Small batches are added one by one; large ones rebuild all sublists from a merge
+        # (Timsort runs in near-linear time on the two sorted runs)
+        values = list(values)
+        if len(values) * 8 < self._len:
+            for value in values:
+                self.add(value)
+            return
+        items = [x for sub in self._lists for x in sub]
+        items.extend(sorted(values))
+        items.sort()
+        self._lists = [items[i:i + self.load] for i in range(0, len(items), self.load)]
+        self._maxes = [sub[-1] for sub in self._lists]
+        self._len = len(items)
+        self._tree = None
+
+    def remove(self, value):
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            raise ValueError(f"{value!r} not in SortedList")
+        sub = self._lists[pos]
+        idx = bisect_left(sub, value)
+        if sub[idx] != value:
+            raise ValueError(f"{value!r} not in SortedList")
+        del sub[idx]
+        self._len -= 1
+        if not sub:
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._tree = None
+            return
+        self._maxes[pos] = sub[-1]
+        if len(sub) < self.load // 2 and len(self._lists) > 1:
+            self._merge(pos)
+        elif self._tree is not None:
+            self._tree_update(pos, -1)
+
+    def _split(self, pos):
+        sub = self._lists[pos]
+        self._lists.insert(pos + 1, sub[self.load:])
+        del sub[self.load:]
+        self._maxes.insert(pos, sub[-1])
+        self._tree = None
+
+    def _merge(self, pos):
+        # Fold an underfull sublist into a neighbour, re-splitting if that overflows
+        if pos == len(self._lists) - 1:
+            pos -= 1
+        self._lists[pos].extend(self._lists.pop(pos + 1))
+        self._maxes[pos] = self._lists[pos][-1]
+        del self._maxes[pos + 1]
+        self._tree = None
+        if len(self._lists[pos]) > 2 * self.load:
+            self._split(pos)
+
+    def _build_tree(self):
+        tree = [0] + [len(sub) for sub in self._lists]
+        for i in range(1, len(tree)):
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _tree_update(self, pos, delta):
+        i = pos + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, pos):
+        # Number of items in sublists before pos
+        if self._tree is None:
+            self._build_tree()
+        total = 0
+        i = pos
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, k):
+        # (sublist, offset) of the k-th smallest item, by descending the Fenwick tree
+        if self._tree is None:
+            self._build_tree()
+        pos = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self._tree) and self._tree[nxt] <= k:
+                pos = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return pos, k
+
+    def _rank_left(self, value):
+        # Number of items < value
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._prefix(pos) + bisect_left(self._lists[pos], value)
+
+    def _rank_right(self, value):
+        # Number of items <= value
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._prefix(pos) + bisect_right(self._lists[pos], value)
+
+    def bisect_left(self, value):
+        # Insertion point before any equal items, in container order
+        return self._len - self._rank_right(value) if self.reverse else self._rank_left(value)
+
+    def bisect_right(self, value):
+        # Insertion point after any equal items, in container order
+        return self._len - self._rank_left(value) if self.reverse else self._rank_right(value)
+
+    bisect = bisect_right
+
+    def index(self, value):
+        if value not in self:
+            raise ValueError(f"{value!r} not in SortedList")
+        return self.bisect_left(value)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SortedList index out of range")
+        if self.reverse:
+            index = self._len - 1 - index
+        pos, offset = self._locate(index)
+        return self._lists[pos][offset]
+
 def parse_input(input_str):
     # Parses a comma-separated string into a list of integers.
     # Example: "9,3,6,1" -> [9, 3, 6, 1]
@@ -20,7 +218,39 @@ def parse_input(input_str):
         return []
 
 
+def benchmark_streaming(n=10**6, baseline_n=5000, seed=42):
+    # Streaming inserts: SortedList.add vs appending and re-running insertion_sort_desc.
+    # The baseline is O(n) per insert (O(n^2) overall), so it runs on a prefix and is extrapolated.
+    rng = random.Random(seed)
+    readings = [rng.randint(0, 10**9) for _ in range(n)]
+
+    container = SortedList()
+    start = time.perf_counter()
+    for value in readings:
+        container.add(value)
+    sorted_time = time.perf_counter() - start
+
+    arr = []
+    start = time.perf_counter()
+    for value in readings[:baseline_n]:
+        arr.append(value)
+        insertion_sort_desc(arr)
+    baseline_time = time.perf_counter() - start
+    assert arr == sorted(readings[:baseline_n], reverse=True)
+    assert list(container) == sorted(readings, reverse=True)
+
+    estimate = baseline_time * (n / baseline_n) ** 2
+    print(f"{n:,} streaming inserts")
+    print(f"{'SortedList.add:':<32}{sorted_time:10.2f} s ({sorted_time / n * 1e6:.2f} us/insert)")
+    print(f"{'insertion_sort_desc per insert:':<32}{baseline_time:10.2f} s for {baseline_n:,} "
+          f"(~{estimate:,.0f} s extrapolated to {n:,})")
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark_streaming(int(float(sys.argv[2])) if len(sys.argv) > 2 else 10**6)
+        sys.exit()
+
     print("Insertion Sort in Monotonically Decreasing Order")
     user_input = input("Enter a list of integers (comma-separated), or press Enter to use default: ")
 
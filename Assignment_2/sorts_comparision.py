@@ -1,6 +1,7 @@
 import random
 import time
 import tracemalloc
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -34,6 +35,106 @@ def merge(left, right):
     result.extend(left[i:]); result.extend(right[j:])
     return result
 
+# ─── Non-comparison Integer Sorts ─────────────────────────────────────────────
+# Stable, for ints or items with int keys (key=...); negatives are handled by
+# offsetting keys by their minimum. NumPy arrays take a vectorized path, lists
+# a pure-Python one; the result has the same kind as the input.
+
+def _keys(arr, key):
+    if key is None:
+        return arr
+    if isinstance(arr, np.ndarray):
+        return np.fromiter((key(x) for x in arr), dtype=np.int64, count=len(arr))
+    return [key(x) for x in arr]
+
+def _key_range(keys):
+    # Python ints, so hi + 1 and hi - lo cannot overflow a narrow NumPy dtype
+    if isinstance(keys, np.ndarray):
+        return int(keys.min()), int(keys.max())
+    return min(keys), max(keys)
+
+def counting_sort(arr, key=None):
+    """O(n + k) for key range k: histogram, prefix sums, stable scatter"""
+    if len(arr) == 0:
+        return arr[:0] if isinstance(arr, np.ndarray) else []
+    keys = _keys(arr, key)
+    lo, hi = _key_range(keys)
+    if isinstance(arr, np.ndarray):
+        keys = np.asarray(keys, dtype=np.int64) - lo
+        if key is None:
+            counts = np.bincount(keys)
+            return np.repeat(np.arange(lo, hi + 1, dtype=np.int64), counts).astype(arr.dtype)
+        # Items, not just keys: scatter via the stable byte-wise order (k small => few passes)
+        return arr[_radix_order(keys)]
+
+    counts = [0] * (hi - lo + 1)
+    for k in keys:
+        counts[k - lo] += 1
+    if key is None:
+        result = []
+        for offset, count in enumerate(counts):
+            if count:
+                result.extend([offset + lo] * count)
+        return result
+    starts = []
+    total = 0
+    for count in counts:
+        starts.append(total)
+        total += count
+    result = [None] * len(arr)
+    for item, k in zip(arr, keys):
+        result[starts[k - lo]] = item
+        starts[k - lo] += 1
+    return result
+
+def _offset_keys(keys, lo):
+    """keys - lo as uint64: a range up to 2**64 - 1 would wrap in int64"""
+    return np.asarray(keys).astype(np.int64).view(np.uint64) - np.uint64(lo % 2**64)
+
+def _radix_order(keys):
+    """Stable permutation sorting non-negative integer keys, one byte per pass"""
+    order = np.arange(len(keys))
+    max_key = int(keys.max())
+    shift = 0
+    while max_key >> shift:
+        digits = ((keys[order] >> shift) & 0xFF).astype(np.uint8)
+        # Skip passes where every key shares the digit; otherwise a stable
+        # scatter by digit (NumPy's stable sort on uint8 is itself a counting sort)
+        if np.bincount(digits, minlength=256).max() < len(order):
+            order = order[np.argsort(digits, kind='stable')]
+        shift += 8
+    return order
+
+def radix_sort(arr, key=None):
+    """LSD radix sort on bytes: O(n * bytes per key), independent of n log n"""
+    if len(arr) == 0:
+        return arr[:0] if isinstance(arr, np.ndarray) else []
+    keys = _keys(arr, key)
+    lo, _ = _key_range(keys)
+    if isinstance(arr, np.ndarray):
+        return arr[_radix_order(_offset_keys(keys, lo))]
+
+    pairs = list(zip((k - lo for k in keys), arr)) if key is not None else [k - lo for k in keys]
+    digit = (lambda p: p[0]) if key is not None else (lambda p: p)
+    max_key = max(keys) - lo
+    shift = 0
+    while max_key >> shift:
+        buckets = [[] for _ in range(256)]
+        for p in pairs:
+            buckets[(digit(p) >> shift) & 0xFF].append(p)
+        pairs = [p for bucket in buckets for p in bucket]
+        shift += 8
+    return [item for _, item in pairs] if key is not None else [k + lo for k in pairs]
+
+def integer_sort(arr, key=None):
+    """Counting sort when the key range is at most n, else LSD radix sort"""
+    if len(arr) == 0:
+        return arr[:0] if isinstance(arr, np.ndarray) else []
+    lo, hi = _key_range(_keys(arr, key))
+    if hi - lo + 1 <= len(arr):
+        return counting_sort(arr, key)
+    return radix_sort(arr, key)
+
 # ─── Measurement Helpers ───────────────────────────────────────────────────────
 
 def make_datasets(n):
@@ -41,7 +142,8 @@ def make_datasets(n):
     return {
         'sorted':  base[:],
         'reverse': base[::-1],
-        'random':  random.sample(base, k=n)
+        'random':  random.sample(base, k=n),
+        'repeated': [random.choice([1, 2, 3]) for _ in range(n)]
     }
 
 def measure(func, data):
@@ -64,10 +166,12 @@ if __name__ == "__main__":
     for n in ns:
         datasets = make_datasets(n)
         for data_type, data in datasets.items():
-            for name, algo in (('QuickSort', quick_sort), ('MergeSort', merge_sort)):
+            for name, algo in (('QuickSort', quick_sort), ('MergeSort', merge_sort),
+                               ('CountingSort', counting_sort), ('RadixSort', radix_sort),
+                               ('RadixSort-NumPy', lambda a: radix_sort(np.asarray(a)))):
                 t, m = measure(algo, data)
                 results.append((name, n, data_type, t, m))
-                print(f"{name:<10} {n:6} {data_type:>10} {t:10.4f} {m:10.1f}")
+                print(f"{name:<15} {n:6} {data_type:>10} {t:10.4f} {m:10.1f}")
 
     # build DataFrame and save CSV
     df = pd.DataFrame(results, columns=["Algorithm","n","Type","Time_s","Mem_KB"])
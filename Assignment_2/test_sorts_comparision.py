@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from sorts_comparision import counting_sort, integer_sort, radix_sort
+
+BOUNDARY_ARRAYS = [
+    np.array([255, 0, 254, 255, 1], dtype=np.uint8),
+    np.array([127, -128, 0, 127, -1], dtype=np.int8),
+    np.array([32767, -32768, 32766, 0], dtype=np.int16),
+    np.array([2**31 - 1, 2**31 - 3, 2**31 - 2, 2**31 - 1], dtype=np.int32),
+]
+# Key ranges ~2**32 and ~2**64: too wide for counting sort, integer_sort must
+# pick radix, and hi - lo overflows int64 for the last two
+WIDE_ARRAYS = BOUNDARY_ARRAYS + [
+    np.array([-2**31, 2**31 - 1, 0], dtype=np.int32),
+    np.array([-2**63, 2**63 - 1, 0], dtype=np.int64),
+    np.array([2**64 - 1, 0, 2**63], dtype=np.uint64),
+]
+
+@pytest.mark.parametrize('arr', BOUNDARY_ARRAYS, ids=lambda a: str(a.dtype))
+def test_counting_dtype_boundaries(arr):
+    result = counting_sort(arr)
+    assert result.dtype == arr.dtype
+    np.testing.assert_array_equal(result, np.sort(arr))
+
+@pytest.mark.parametrize('sort', [radix_sort, integer_sort])
+@pytest.mark.parametrize('arr', WIDE_ARRAYS, ids=lambda a: str(a.dtype))
+def test_dtype_boundaries(sort, arr):
+    result = sort(arr)
+    assert result.dtype == arr.dtype
+    np.testing.assert_array_equal(result, np.sort(arr))
+
+@pytest.mark.parametrize('sort', [counting_sort, radix_sort, integer_sort])
+@pytest.mark.parametrize('arr', BOUNDARY_ARRAYS, ids=lambda a: str(a.dtype))
+def test_list_boundaries(sort, arr):
+    data = arr.tolist()
+    assert sort(data) == sorted(data)
+
+@pytest.mark.parametrize('sort', [counting_sort, radix_sort, integer_sort])
+def test_keyed_sort_is_stable(sort):
+    items = [(k, i) for i, k in enumerate([3, -1, 3, 0, -1, 255])]
+    expected = sorted(items, key=lambda p: p[0])
+    assert sort(items, key=lambda p: p[0]) == expected
+    arr = np.array(items, dtype=[('k', np.int64), ('i', np.int64)])
+    assert sort(arr, key=lambda p: int(p['k'])).tolist() == expected
+
+def test_empty():
+    assert counting_sort([]) == []
+    assert integer_sort(np.array([], dtype=np.uint8)).dtype == np.uint8
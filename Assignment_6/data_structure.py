@@ -1,4 +1,11 @@
+import sys
 import time
+import platform
+import struct
+import tracemalloc
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -37,6 +44,147 @@ class Stack:
     def peek(self):
         return self.data[-1]
 
+# Typed Array backed by a contiguous NumPy buffer
+class TypedArray:
+    """
+    Fixed-size array of unboxed values (e.g. int64 = 8 bytes per element).
+    Slices and access_range return views into the same buffer. np.asarray(arr)
+    shares memory on any Python; memoryview(arr) needs Python 3.12+ (PEP 688
+    __buffer__), so older versions use memoryview(arr.buffer).
+    """
+    def __init__(self, size, dtype=np.int64, fill=0):
+        self.data = np.full(size, fill, dtype=dtype)
+        self.size = size
+        self.fill = fill
+
+    def _check(self, index):
+        if index < 0 or index >= self.size:
+            raise IndexError("Index out of bounds")
+
+    def _check_range(self, start, stop):
+        if start < 0 or stop > self.size or start > stop:
+            raise IndexError("Range out of bounds")
+
+    def insert(self, index, value):
+        self._check(index)
+        self.data[index] = value
+
+    def delete(self, index):
+        # No None slot in a typed buffer, so deleted cells are reset to fill
+        self._check(index)
+        self.data[index] = self.fill
+
+    def access(self, index):
+        self._check(index)
+        return self.data[index].item()
+
+    def insert_range(self, start, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        self._check_range(start, start + len(values))
+        self.data[start:start + len(values)] = values
+
+    def delete_range(self, start, stop):
+        self._check_range(start, stop)
+        self.data[start:stop] = self.fill
+
+    def access_range(self, start, stop):
+        self._check_range(start, stop)
+        return self.data[start:stop]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.data[index]
+        self._check(index)
+        return self.data[index].item()
+
+    def __len__(self):
+        return self.size
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype, copy=False)
+
+    def __buffer__(self, flags):
+        # PEP 688: only consulted on Python 3.12+
+        return memoryview(self.data)
+
+    @property
+    def buffer(self):
+        """The underlying ndarray; exports the buffer protocol on every Python version"""
+        return self.data
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+# Typed Stack with amortized doubling over a NumPy buffer; buffer access as for
+# TypedArray, covering only the live elements
+class TypedStack:
+    def __init__(self, dtype=np.int64, capacity=16):
+        self.data = np.empty(max(capacity, 1), dtype=dtype)
+        self.top = 0
+
+    def _reserve(self, extra):
+        needed = self.top + extra
+        if needed > len(self.data):
+            grown = np.empty(max(needed, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.top] = self.data[:self.top]
+            self.data = grown
+
+    def push(self, value):
+        if self.top == len(self.data):
+            self._reserve(1)
+        self.data[self.top] = value
+        self.top += 1
+
+    def pop(self):
+        if self.top == 0:
+            raise IndexError("pop from empty stack")
+        self.top -= 1
+        return self.data[self.top].item()
+
+    def peek(self):
+        if self.top == 0:
+            raise IndexError("peek from empty stack")
+        return self.data[self.top - 1].item()
+
+    def push_many(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        self._reserve(len(values))
+        self.data[self.top:self.top + len(values)] = values
+        self.top += len(values)
+
+    def pop_many(self, k):
+        # Copy out: the popped region is overwritten by later pushes
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        if k > self.top:
+            raise IndexError("pop from empty stack")
+        self.top -= k
+        return self.data[self.top:self.top + k][::-1].copy()
+
+    def view(self):
+        return self.data[:self.top]
+
+    def __len__(self):
+        return self.top
+
+    def __array__(self, dtype=None, copy=None):
+        view = self.view()
+        return view if dtype is None else view.astype(dtype, copy=False)
+
+    def __buffer__(self, flags):
+        # PEP 688: only consulted on Python 3.12+
+        return memoryview(self.view())
+
+    @property
+    def buffer(self):
+        """View of the live elements; valid until the next push regrows storage"""
+        return self.view()
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
 # Queue using Circular Array
 class Queue:
     def __init__(self, capacity):
@@ -61,6 +209,132 @@ class Queue:
         self.count -= 1
         return value
 
+# Single-producer/single-consumer ring buffer over shared memory
+class SharedRingBuffer:
+    """
+    Same circular-array idea as Queue, laid out in a SharedMemory block so
+    two processes can exchange bytes without pickling or locks:
+
+        [head | pad][tail | pad][slot 0][slot 1]...   slot = length + payload
+
+    head/tail are monotonically increasing counters (slot = counter % capacity),
+    each written by exactly one side, so a full/empty check needs no shared
+    count. The producer fills a slot before publishing tail and the consumer
+    reads it before publishing head. CPython emits no memory fences, so this
+    is only safe without a lock where the CPU keeps stores in program order:
+    x86 (TSO). On ARM64 and other weakly ordered CPUs the tail update can
+    become visible before the payload; pass the same multiprocessing.Lock
+    as lock= on both sides there and every put/get runs under it.
+    """
+    HEADER = 128  # head and tail on separate cache lines
+    LEN = struct.Struct("<I")
+
+    def __init__(self, capacity=1024, slot_size=256, name=None, create=True, lock=None):
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.max_message = slot_size - self.LEN.size
+        size = self.HEADER + capacity * slot_size
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.shm.buf[:self.HEADER] = bytes(self.HEADER)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self.counters = self.buf[:self.HEADER].cast("q")  # [0] = head, [8] = tail
+        self.lock = lock
+
+    @classmethod
+    def attach(cls, name, capacity, slot_size, lock=None):
+        return cls(capacity, slot_size, name=name, create=False, lock=lock)
+
+    def __len__(self):
+        return self.counters[8] - self.counters[0]
+
+    def _offset(self, counter):
+        return self.HEADER + (counter % self.capacity) * self.slot_size
+
+    # Producer side
+    def try_put(self, message):
+        if len(message) > self.max_message:
+            raise ValueError("Message larger than slot")
+        if self.lock is None:
+            return self._try_put(message)
+        with self.lock:
+            return self._try_put(message)
+
+    def _try_put(self, message):
+        tail = self.counters[8]
+        if tail - self.counters[0] == self.capacity:
+            return False
+        offset = self._offset(tail)
+        self.LEN.pack_into(self.buf, offset, len(message))
+        start = offset + self.LEN.size
+        self.buf[start:start + len(message)] = message
+        self.counters[8] = tail + 1
+        return True
+
+    def put(self, message, block=True, timeout=None):
+        if self.try_put(message):
+            return
+        if not block:
+            raise OverflowError("Queue full")
+        self._wait(lambda: self.try_put(message), timeout, OverflowError("Queue full"))
+
+    # Consumer side
+    def try_get(self):
+        if self.lock is None:
+            return self._try_get()
+        with self.lock:
+            return self._try_get()
+
+    def _try_get(self):
+        head = self.counters[0]
+        if head == self.counters[8]:
+            return None
+        offset = self._offset(head)
+        (length,) = self.LEN.unpack_from(self.buf, offset)
+        start = offset + self.LEN.size
+        message = bytes(self.buf[start:start + length])
+        self.counters[0] = head + 1
+        return message
+
+    def get(self, block=True, timeout=None):
+        """
+        Blocking mode spins briefly, then yields the CPU between polls;
+        block=False (or poll()) returns immediately.
+        """
+        message = self.try_get()
+        if message is not None:
+            return message
+        if not block:
+            raise IndexError("Queue empty")
+        return self._wait(self.try_get, timeout, IndexError("Queue empty"))
+
+    def poll(self):
+        return self.try_get()
+
+    def _wait(self, attempt, timeout, error):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        spins = 0
+        while True:
+            result = attempt()
+            if result is not None and result is not False:  # b"" is a valid message
+                return result
+            if deadline is not None and time.perf_counter() > deadline:
+                raise error
+            spins += 1
+            if spins > 1000:
+                time.sleep(0)
+
+    def close(self):
+        self.counters.release()
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
 # Singly Linked List
 class Node:
     def __init__(self, data):
@@ -93,90 +367,341 @@ class LinkedList:
         if cur.next:
             cur.next = cur.next.next
 
-# Benchmarking Function
-def benchmark():
+# Workload-driven benchmarking
+def _prefilled_linked_list(n):
+    # Build n nodes directly; insert_end would make setup itself O(n^2)
+    ll = LinkedList()
+    cur = None
+    for i in range(n):
+        node = Node(i)
+        if cur is None:
+            ll.head = node
+        else:
+            cur.next = node
+        cur = node
+    return ll
+
+def _filled(structure, n):
+    if isinstance(structure, Array):
+        for i in range(n):
+            structure.insert(i, i)
+    elif isinstance(structure, TypedArray):
+        structure.insert_range(0, np.arange(n))
+    elif isinstance(structure, TypedStack):
+        structure.push_many(np.arange(n))
+    elif isinstance(structure, Stack):
+        for i in range(n):
+            structure.push(i)
+    elif isinstance(structure, Queue):
+        for i in range(n):
+            structure.enqueue(i)
+    elif isinstance(structure, LinkedList) and structure.head is None:
+        structure.head = _prefilled_linked_list(n).head
+    return structure
+
+def _mixed_trace(rng, n, push, pop, push_share):
+    # Pops on an empty structure become pushes so every trace is valid
+    coins = (rng.random(n) < push_share).tolist()
+    codes, args, size = [], [], 0
+    for i, is_push in enumerate(coins):
+        if is_push or size == 0:
+            codes.append(push)
+            args.append(i)
+            size += 1
+        else:
+            codes.append(pop)
+            args.append(None)
+            size -= 1
+    return codes, args
+
+def _random_index_trace(rng, n, op):
+    return [op] * n, rng.integers(0, n, n).tolist()
+
+# Each workload: setup(n) -> structure, trace(rng, n) -> (op names, args),
+# expected per-operation exponent (0 = O(1), 1 = O(n)) and the largest n to run.
+# "expected" is the ideal for the operation, not what the structure achieves:
+# a tail pointer makes insert_end O(1) and a value -> node map makes
+# delete_value O(1), so fit_complexity flags LinkedList's O(n) walks.
+# Op names resolve to the structure's methods unless "ops" maps them explicitly.
+WORKLOADS = [
+    {"Structure": "Array", "Workload": "Sequential Insert", "expected": 0, "max_n": 10**7,
+     "setup": lambda n: Array(n), "trace": lambda rng, n: (["insert_at"] * n, list(range(n))),
+     "ops": lambda arr: {"insert_at": lambda i: arr.insert(i, i)}},
+    {"Structure": "Array", "Workload": "Random Access", "expected": 0, "max_n": 10**7,
+     "setup": lambda n: _filled(Array(n), n), "trace": lambda rng, n: _random_index_trace(rng, n, "access")},
+    {"Structure": "TypedArray", "Workload": "Random Access", "expected": 0, "max_n": 10**7,
+     "setup": lambda n: _filled(TypedArray(n), n), "trace": lambda rng, n: _random_index_trace(rng, n, "access")},
+    {"Structure": "Stack", "Workload": "70% Push / 30% Pop", "expected": 0, "max_n": 10**7,
+     "setup": lambda n: Stack(), "trace": lambda rng, n: _mixed_trace(rng, n, "push", "pop", 0.7)},
+    {"Structure": "TypedStack", "Workload": "70% Push / 30% Pop", "expected": 0, "max_n": 10**7,
+     "setup": lambda n: TypedStack(), "trace": lambda rng, n: _mixed_trace(rng, n, "push", "pop", 0.7)},
+    {"Structure": "Queue", "Workload": "50% Enqueue / 50% Dequeue", "expected": 0, "max_n": 10**7,
+     "setup": lambda n: Queue(n), "trace": lambda rng, n: _mixed_trace(rng, n, "enqueue", "dequeue", 0.5)},
+    {"Structure": "Linked List", "Workload": "Insert End", "expected": 0, "max_n": 10**4,
+     "setup": lambda n: LinkedList(), "trace": lambda rng, n: (["insert_end"] * n, list(range(n)))},
+    {"Structure": "Linked List", "Workload": "Random Delete by Value", "expected": 0, "max_n": 10**4,
+     "setup": _prefilled_linked_list,
+     "trace": lambda rng, n: (["delete_value"] * n, rng.permutation(n).tolist())},
+]
+
+def _replay(structure, names, args, ops=None):
+    ops = ops or {name: getattr(structure, name) for name in set(names)}
+    start = time.perf_counter_ns()
+    for name, arg in zip(names, args):
+        if arg is None:
+            ops[name]()
+        else:
+            ops[name](arg)
+    return time.perf_counter_ns() - start
+
+def _bytes_per_element(setup, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = _filled(setup(n), n)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del structure
+    return used / n
+
+# Half-decade steps below 10**4 so the O(n) linked-list workloads still get
+# enough points for fit_complexity
+def benchmark(sizes=(10**2, 3 * 10**2, 10**3, 3 * 10**3, 10**4, 10**5, 10**6, 10**7),
+              repeats=3, workloads=None, memory_max_n=10**6, seed=42, verbose=False):
+    """
+    Replays each workload's operation trace at every size (up to its max_n),
+    `repeats` times on a fresh structure, and records ns/op (median and best)
+    plus bytes per stored element. verbose prints each result as it lands.
+    """
+    rng = np.random.default_rng(seed)
     results = []
+    for workload in workloads or WORKLOADS:
+        for n in sizes:
+            if n > workload["max_n"]:
+                continue
+            names, args = workload["trace"](rng, n)
+            timings = []
+            for _ in range(repeats):
+                structure = workload["setup"](n)
+                ops = workload["ops"](structure) if "ops" in workload else None
+                timings.append(_replay(structure, names, args, ops) / n)
+                del structure
+            results.append({
+                "Structure": workload["Structure"],
+                "Workload": workload["Workload"],
+                "n": n,
+                "ns/op (median)": float(np.median(timings)),
+                "ns/op (best)": min(timings),
+                "Bytes/Element": (_bytes_per_element(workload["setup"], n)
+                                  if n <= memory_max_n else np.nan),
+            })
+            if verbose:
+                print(f"{workload['Structure']:<12} {workload['Workload']:<26} n={n:<9} "
+                      f"{results[-1]['ns/op (median)']:10.1f} ns/op")
+    return pd.DataFrame(results)
 
-    # Array
-    arr = Array(1000)
-    start = time.perf_counter()
-    for i in range(1000):
-        arr.insert(i, i)
-    end = time.perf_counter()
-    results.append({"Structure": "Array", "Operation": "Insert", "Time (ms)": round((end - start) * 1000, 4)})
+def fit_complexity(df, workloads=None, tolerance=0.3, min_points=4):
+    """
+    Fits log(ns/op) = slope * log(n) + c per workload. The slope is the
+    per-operation exponent, so O(1) ops should fit ~0 and O(n) ops ~1;
+    anything above expected + tolerance is flagged. Workloads measured at
+    fewer than min_points sizes are skipped.
+    """
+    expected = {(w["Structure"], w["Workload"]): w["expected"] for w in workloads or WORKLOADS}
+    fits = []
+    for (structure, workload), group in df.groupby(["Structure", "Workload"], sort=False):
+        if len(group) < min_points:
+            continue
+        slope, _ = np.polyfit(np.log(group["n"]), np.log(group["ns/op (median)"]), 1)
+        exp = expected.get((structure, workload), 0)
+        fits.append({"Structure": structure, "Workload": workload,
+                     "Fitted Exponent": round(float(slope), 3), "Expected": exp,
+                     "Worse Than Expected": bool(slope > exp + tolerance)})
+    return pd.DataFrame(fits)
+
+# Boxed list storage vs typed buffers: bytes/element and bulk throughput
+def list_bytes_per_element(data):
+    # List slots plus every distinct boxed object they point to
+    objects = {id(x): x for x in data if x is not None}
+    total = sys.getsizeof(data) + sum(sys.getsizeof(x) for x in objects.values())
+    return total / len(data)
 
+def compare_typed_storage(n=1_000_000, dtype=np.int64):
+    results = []
+    values = np.arange(n, dtype=dtype)
+    py_values = values.tolist()
+
+    arr = Array(n)
+    start = time.perf_counter()
+    for i, v in enumerate(py_values):
+        arr.insert(i, v)
+    insert_s = time.perf_counter() - start
     start = time.perf_counter()
-    for i in range(1000):
+    for i in range(n):
         arr.access(i)
-    end = time.perf_counter()
-    results.append({"Structure": "Array", "Operation": "Access", "Time (ms)": round((end - start) * 1000, 4)})
+    access_s = time.perf_counter() - start
+    results.append({"Structure": "Array", "Bytes/Element": list_bytes_per_element(arr.data),
+                    "Bulk Insert (M elem/s)": n / insert_s / 1e6,
+                    "Bulk Access (M elem/s)": n / access_s / 1e6})
 
+    tarr = TypedArray(n, dtype=dtype)
     start = time.perf_counter()
-    for i in range(1000):
-        arr.delete(i)
-    end = time.perf_counter()
-    results.append({"Structure": "Array", "Operation": "Delete", "Time (ms)": round((end - start) * 1000, 4)})
+    tarr.insert_range(0, values)
+    insert_s = time.perf_counter() - start
+    start = time.perf_counter()
+    tarr.access_range(0, n).sum()
+    access_s = time.perf_counter() - start
+    results.append({"Structure": "TypedArray", "Bytes/Element": tarr.nbytes / n,
+                    "Bulk Insert (M elem/s)": n / insert_s / 1e6,
+                    "Bulk Access (M elem/s)": n / access_s / 1e6})
 
-    # Stack
     stack = Stack()
     start = time.perf_counter()
-    for i in range(1000):
-        stack.push(i)
-    end = time.perf_counter()
-    results.append({"Structure": "Stack", "Operation": "Push", "Time (ms)": round((end - start) * 1000, 4)})
-
+    for v in py_values:
+        stack.push(v)
+    push_s = time.perf_counter() - start
     start = time.perf_counter()
-    for i in range(1000):
+    for _ in range(n):
         stack.pop()
-    end = time.perf_counter()
-    results.append({"Structure": "Stack", "Operation": "Pop", "Time (ms)": round((end - start) * 1000, 4)})
+    pop_s = time.perf_counter() - start
+    for v in py_values:
+        stack.push(v)
+    results.append({"Structure": "Stack", "Bytes/Element": list_bytes_per_element(stack.data),
+                    "Bulk Insert (M elem/s)": n / push_s / 1e6,
+                    "Bulk Access (M elem/s)": n / pop_s / 1e6})
 
-    # Queue
-    queue = Queue(1000)
+    tstack = TypedStack(dtype=dtype)
     start = time.perf_counter()
-    for i in range(1000):
-        queue.enqueue(i)
-    end = time.perf_counter()
-    results.append({"Structure": "Queue", "Operation": "Enqueue", "Time (ms)": round((end - start) * 1000, 4)})
-
+    tstack.push_many(values)
+    push_s = time.perf_counter() - start
     start = time.perf_counter()
-    for i in range(1000):
-        queue.dequeue()
-    end = time.perf_counter()
-    results.append({"Structure": "Queue", "Operation": "Dequeue", "Time (ms)": round((end - start) * 1000, 4)})
+    tstack.pop_many(n)
+    pop_s = time.perf_counter() - start
+    tstack.push_many(values)
+    results.append({"Structure": "TypedStack", "Bytes/Element": tstack.nbytes / n,
+                    "Bulk Insert (M elem/s)": n / push_s / 1e6,
+                    "Bulk Access (M elem/s)": n / pop_s / 1e6})
 
-    # Linked List
-    ll = LinkedList()
-    start = time.perf_counter()
-    for i in range(1000):
-        ll.insert_end(i)
-    end = time.perf_counter()
-    results.append({"Structure": "Linked List", "Operation": "Insert End", "Time (ms)": round((end - start) * 1000, 4)})
+    return pd.DataFrame(results)
+
+# Shared-memory ring buffer vs multiprocessing.Queue
+def _ring_lock():
+    # Only x86's store ordering makes the lock-free handoff safe (see SharedRingBuffer)
+    if platform.machine().lower() in ("x86_64", "amd64", "i386", "i686"):
+        return None
+    return mp.Lock()
+
+def _ring_producer(name, capacity, slot_size, n_messages, payload_size, lock):
+    ring = SharedRingBuffer.attach(name, capacity, slot_size, lock)
+    payload = bytes(payload_size)
+    for _ in range(n_messages):
+        ring.put(payload)
+    ring.close()
+
+def _ring_echo(request_name, reply_name, capacity, slot_size, n_messages, request_lock, reply_lock):
+    requests = SharedRingBuffer.attach(request_name, capacity, slot_size, request_lock)
+    replies = SharedRingBuffer.attach(reply_name, capacity, slot_size, reply_lock)
+    for _ in range(n_messages):
+        replies.put(requests.get())
+    requests.close()
+    replies.close()
 
+def _mp_queue_producer(queue, n_messages, payload_size):
+    payload = bytes(payload_size)
+    for _ in range(n_messages):
+        queue.put(payload)
+
+def _mp_queue_echo(requests, replies, n_messages):
+    for _ in range(n_messages):
+        replies.put(requests.get())
+
+def _consume(get, n_messages):
     start = time.perf_counter()
-    for i in range(1000):
-        ll.delete_value(i)
-    end = time.perf_counter()
-    results.append({"Structure": "Linked List", "Operation": "Delete by Value", "Time (ms)": round((end - start) * 1000, 4)})
+    for _ in range(n_messages):
+        get()
+    return time.perf_counter() - start
 
-    return pd.DataFrame(results)
+def _round_trips(put, get, n_messages, payload_size):
+    # One message in flight, so each sample is transport latency, not queueing delay
+    payload = bytes(payload_size)
+    latencies = np.empty(n_messages, dtype=np.int64)
+    for i in range(n_messages):
+        start = time.perf_counter_ns()
+        put(payload)
+        get()
+        latencies[i] = time.perf_counter_ns() - start
+    return latencies
+
+def benchmark_ring_buffer(n_messages=200_000, n_round_trips=20_000, payload_size=64, capacity=4096):
+    """
+    Throughput with the producer running flat out, and ping-pong round-trip
+    latency through an echo process, for SharedRingBuffer vs multiprocessing.Queue
+    """
+    results = []
+    slot_size = payload_size + SharedRingBuffer.LEN.size
+
+    ring = SharedRingBuffer(capacity, slot_size, lock=_ring_lock())
+    producer = mp.Process(target=_ring_producer,
+                          args=(ring.name, capacity, slot_size, n_messages, payload_size, ring.lock))
+    producer.start()
+    elapsed = _consume(ring.get, n_messages)
+    producer.join()
+    replies = SharedRingBuffer(capacity, slot_size, lock=_ring_lock())
+    echo = mp.Process(target=_ring_echo,
+                      args=(ring.name, replies.name, capacity, slot_size, n_round_trips,
+                            ring.lock, replies.lock))
+    echo.start()
+    latencies = _round_trips(ring.put, replies.get, n_round_trips, payload_size)
+    echo.join()
+    for r in (ring, replies):
+        r.close()
+        r.unlink()
+    results.append(("SharedRingBuffer" + (" (locked)" if ring.lock else ""), elapsed, latencies))
+
+    queue = mp.Queue(capacity)
+    producer = mp.Process(target=_mp_queue_producer, args=(queue, n_messages, payload_size))
+    producer.start()
+    elapsed = _consume(queue.get, n_messages)
+    producer.join()
+    reply_queue = mp.Queue(capacity)
+    echo = mp.Process(target=_mp_queue_echo, args=(queue, reply_queue, n_round_trips))
+    echo.start()
+    latencies = _round_trips(queue.put, reply_queue.get, n_round_trips, payload_size)
+    echo.join()
+    results.append(("multiprocessing.Queue", elapsed, latencies))
+
+    return pd.DataFrame([{
+        "Transport": name,
+        "Messages/sec": n_messages / elapsed,
+        "p50 Round Trip (us)": np.percentile(lat, 50) / 1e3,
+        "p99 Round Trip (us)": np.percentile(lat, 99) / 1e3,
+    } for name, elapsed, lat in results])
 
 # Main
 if __name__ == "__main__":
     df = benchmark()
     print("\nPart 2 - Data Structures Performance:\n")
-    print(df.to_string(index=False))
+    print(df.round(2).to_string(index=False))
+
+    print("\nComplexity Fit (per-operation exponent):\n")
+    print(fit_complexity(df).to_string(index=False))
+
+    print("\nTyped vs Boxed Storage (bulk push/pop for stacks):\n")
+    print(compare_typed_storage().round(3).to_string(index=False))
+
+    print("\nInter-process Queue Throughput and Round-Trip Latency:\n")
+    print(benchmark_ring_buffer().round(2).to_string(index=False))
 
     # Plot
     plt.figure(figsize=(12, 6))
-    for structure in df['Structure'].unique():
-        subset = df[df['Structure'] == structure]
-        plt.bar(subset['Structure'] + " - " + subset['Operation'], subset['Time (ms)'])
+    for (structure, workload), subset in df.groupby(["Structure", "Workload"], sort=False):
+        plt.plot(subset["n"], subset["ns/op (median)"], marker="o", label=f"{structure} - {workload}")
 
-    plt.xlabel("Data Structure and Operation")
-    plt.ylabel("Time (ms)")
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("n (operations / elements)")
+    plt.ylabel("Time per operation (ns)")
     plt.title("Performance of Elementary Data Structures")
-    plt.xticks(rotation=45, ha='right')
+    plt.legend(fontsize=8)
     plt.tight_layout()
-    plt.grid(True, linestyle='--', alpha=0.5)
+    plt.grid(True, which="both", linestyle='--', alpha=0.5)
     plt.show()
@@ -6,28 +6,458 @@ Demonstrates the impact of memory access patterns on performance
 import numpy as np
 import time
 import matplotlib.pyplot as plt
-from memory_profiler import profile
 import psutil
 import os
+import sys
+import json
+import shutil
+import argparse
+import multiprocessing as mp
+import itertools
+import threading
+import contextlib
+import signal
+import subprocess
+import tracemalloc
+import weakref
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # optional: without it BLAS threads may oversubscribe cores
+    threadpool_limits = None
+
+def read_cache_sizes(cache_dir='/sys/devices/system/cpu/cpu0/cache'):
+    """
+    Read data/unified cache sizes in bytes from sysfs, e.g. {'L1': 49152, ...}
+    Returns an empty dict where sysfs is unavailable (non-Linux)
+    """
+    units = {'K': 1024, 'M': 1024**2, 'G': 1024**3}
+    sizes = {}
+    if not os.path.isdir(cache_dir):
+        return sizes
+    
+    for entry in sorted(os.listdir(cache_dir)):
+        path = os.path.join(cache_dir, entry)
+        if not entry.startswith('index'):
+            continue
+        try:
+            with open(os.path.join(path, 'type')) as f:
+                cache_type = f.read().strip()
+            with open(os.path.join(path, 'level')) as f:
+                level = f.read().strip()
+            with open(os.path.join(path, 'size')) as f:
+                size = f.read().strip()
+        except OSError:
+            continue
+        if cache_type == 'Instruction':
+            continue
+        multiplier = units.get(size[-1], 1)
+        sizes[f"L{level}"] = int(size.rstrip('KMG')) * multiplier
+    
+    return sizes
+
+def _single_threaded_blas():
+    """Pin BLAS to one thread so parallel speedup comes from our workers"""
+    if threadpool_limits is None:
+        return contextlib.nullcontext()
+    return threadpool_limits(limits=1, user_api='blas')
+
+def _output_tiles(n, m, block_size):
+    return [(i0, j0) for i0 in range(0, n, block_size) for j0 in range(0, m, block_size)]
+
+def _parallel_block_size(n, workers, max_block=256):
+    """Tile side giving at least `workers` row bands, capped so blocks stay cache-sized"""
+    return max(1, min(max_block, -(-n // workers)))
+
+def _compute_tiles(A, B, C, tiles, block_size):
+    """
+    Fill the given output tiles of C = A @ B. Tiles are disjoint, so
+    workers can share C without locking
+    """
+    n, K, m = A.shape[0], A.shape[1], B.shape[1]
+    scratch = np.empty((block_size, block_size), dtype=C.dtype)
+    
+    for i0, j0 in tiles:
+        i_end = min(i0 + block_size, n)
+        j_end = min(j0 + block_size, m)
+        C_tile = C[i0:i_end, j0:j_end]
+        C_tile.fill(0)
+        tmp = scratch[:i_end - i0, :j_end - j0]
+        for k0 in range(0, K, block_size):
+            k_end = min(k0 + block_size, K)
+            np.matmul(A[i0:i_end, k0:k_end], B[k0:k_end, j0:j_end], out=tmp)
+            np.add(C_tile, tmp, out=C_tile)
+
+# Per-process views of A, B and C attached by _attach_shared_matrices
+_shared = {}
+
+def _init_pool_worker():
+    # Keep each process's BLAS single-threaded for the lifetime of the worker
+    _shared['blas_limit'] = _single_threaded_blas()
+    _shared['blas_limit'].__enter__()
+
+def _attach_shared_matrices(specs):
+    """Map the named blocks, reattaching only when the parent replaced a block"""
+    for name, (shm_name, shape, dtype) in specs.items():
+        current = _shared.get(name)
+        if current is not None and current[0].name == shm_name and current[1].shape == shape:
+            continue
+        if current is not None:
+            shm, view = _shared.pop(name)
+            del view
+            shm.close()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+def _compute_shared_tiles(specs, tiles, block_size):
+    _attach_shared_matrices(specs)
+    _compute_tiles(_shared['A'][1], _shared['B'][1], _shared['C'][1], tiles, block_size)
+
+def _release_parallel_resources(pools, blocks):
+    for _, pool in pools.values():
+        pool.shutdown()
+    pools.clear()
+    for shm in blocks.values():
+        shm.close()
+        shm.unlink()
+    blocks.clear()
+
+class PeakRSSSampler:
+    """
+    Context manager sampling this process's RSS from a background thread;
+    psutil has no per-interval peak on Linux, so we take the max sample
+    """
+    
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+    
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+PERF_EVENTS = ['cache-misses', 'cache-references', 'LLC-loads', 'LLC-load-misses']
+
+def perf_available():
+    return sys.platform.startswith('linux') and shutil.which('perf') is not None
+
+def perf_stat(code, events=PERF_EVENTS):
+    """
+    Run `python -c code` under `perf stat` and return {event: count};
+    unsupported or not-counted events are left out
+    """
+    command = ['perf', 'stat', '-x', ',', '-e', ','.join(events), sys.executable, '-c', code]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    counters = {}
+    for line in completed.stderr.splitlines():
+        fields = line.split(',')
+        if len(fields) >= 3 and fields[2] in events and fields[0].isdigit():
+            counters[fields[2]] = int(fields[0])
+    return counters
+
+def cache_line_size(cache_dir='/sys/devices/system/cpu/cpu0/cache/index0'):
+    try:
+        with open(os.path.join(cache_dir, 'coherency_line_size')) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return 64
+
+class BlockSizeTuner:
+    """
+    Picks block size and tile loop order for the tiled multiply by timing
+    short trials, and caches the winner per (n, dtype) on disk
+    """
+    
+    LOOP_ORDERS = ['ijk', 'ikj', 'jik', 'kij']
+    
+    def __init__(self, cache_file=None, max_trial_size=1024, trial_repeats=3):
+        self.cache_file = cache_file or os.path.expanduser('~/.cache/hpc_optimization/autotune.json')
+        self.max_trial_size = max_trial_size
+        self.trial_repeats = trial_repeats
+        self.cache_sizes = read_cache_sizes()
+        # Tuned configs are only valid on the machine that measured them
+        self.machine = {'caches': self.cache_sizes, 'cpus': os.cpu_count()}
+        self.configs = self._load()
+    
+    def _load(self):
+        try:
+            with open(self.cache_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data['configs'] if data.get('machine') == self.machine else {}
+    
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        with open(self.cache_file, 'w') as f:
+            json.dump({'machine': self.machine, 'configs': self.configs}, f, indent=2)
+    
+    def candidate_block_sizes(self, n, dtype):
+        """
+        Powers of two plus, per cache level, the largest multiple of 16
+        for which one tile each of A, B and C (3 * b^2 elements) fits
+        """
+        itemsize = np.dtype(dtype).itemsize
+        candidates = {32, 64, 128, 256, 512}
+        for size in self.cache_sizes.values():
+            b = int((size / (3 * itemsize)) ** 0.5) // 16 * 16
+            if b >= 16:
+                candidates.add(b)
+        return sorted(b for b in candidates if b <= n) or [n]
+    
+    def tune(self, demo, n, dtype):
+        """Return {'block_size', 'loop_order', ...} for an n x n product"""
+        key = f"{n}:{np.dtype(dtype).name}"
+        if key in self.configs:
+            return self.configs[key]
+        
+        m = min(n, self.max_trial_size)
+        rng = np.random.default_rng(0)
+        A = rng.random((m, m)).astype(dtype)
+        B = rng.random((m, m)).astype(dtype)
+        C = np.empty((m, m), dtype=dtype)
+        
+        trials = []
+        for block_size, loop_order in itertools.product(
+                self.candidate_block_sizes(m, dtype), self.LOOP_ORDERS):
+            best = float('inf')
+            for _ in range(self.trial_repeats):
+                start = time.perf_counter()
+                demo.matrix_multiply_tiled(A, B, block_size=block_size, loop_order=loop_order, out=C)
+                best = min(best, time.perf_counter() - start)
+            trials.append({'block_size': block_size, 'loop_order': loop_order,
+                           'seconds': best, 'gflops': 2 * m**3 / best / 1e9})
+        
+        winner = min(trials, key=lambda t: t['seconds'])
+        self.configs[key] = {'block_size': winner['block_size'], 'loop_order': winner['loop_order'],
+                             'trial_size': m, 'trials': trials}
+        self._save()
+        return self.configs[key]
+
+def _compress(major, minor, values, n_major):
+    """
+    Sort COO entries by (major, minor), sum duplicate coordinates and build
+    the compressed pointer array
+    """
+    order = np.lexsort((minor, major))
+    major, minor, values = major[order], minor[order], values[order]
+    if len(major):
+        firsts = np.flatnonzero(np.concatenate(([True], (np.diff(major) != 0) | (np.diff(minor) != 0))))
+        if len(firsts) < len(major):
+            major, minor, values = major[firsts], minor[firsts], np.add.reduceat(values, firsts)
+    counts = np.bincount(major, minlength=n_major)
+    indptr = np.zeros(n_major + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, minor.astype(np.int64), values
+
+class CSRMatrix:
+    """
+    Compressed Sparse Row matrix: row i's nonzeros are
+    data[indptr[i]:indptr[i+1]] at columns indices[indptr[i]:indptr[i+1]]
+    """
+    
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+        self._row_ids = None
+    
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        return cls(*_compress(np.asarray(rows), np.asarray(cols), np.asarray(values), shape[0]), shape)
+    
+    @classmethod
+    def from_dense(cls, M):
+        rows, cols = np.nonzero(M)
+        return cls.from_coo(rows, cols, M[rows, cols], M.shape)
+    
+    @property
+    def nnz(self):
+        return len(self.data)
+    
+    @property
+    def density(self):
+        return self.nnz / (self.shape[0] * self.shape[1])
+    
+    def row_ids(self):
+        """Row index of every stored entry (expanded indptr), cached"""
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return self._row_ids
+    
+    def to_dense(self):
+        M = np.zeros(self.shape, dtype=self.data.dtype)
+        M[self.row_ids(), self.indices] = self.data
+        return M
+    
+    def tocsc(self):
+        return CSCMatrix(*_compress(self.indices, self.row_ids(), self.data, self.shape[1]), self.shape)
+    
+    def matvec(self, x):
+        """SpMV: one gather and one segmented sum over all nonzeros"""
+        return np.bincount(self.row_ids(), weights=self.data * x[self.indices],
+                           minlength=self.shape[0]).astype(np.result_type(self.data, x), copy=False)
+    
+    def matmul(self, other):
+        """
+        SpGEMM with Gustavson's row-by-row algorithm: row i of the product
+        merges rows B[k, :] for each nonzero A[i, k]. Each row's merge is
+        vectorized (gather all contributing entries, then sum duplicates)
+        """
+        if isinstance(other, CSCMatrix):
+            other = other.tocsr()
+        n, m = self.shape[0], other.shape[1]
+        dtype = np.result_type(self.data, other.data)
+        b_lengths = np.diff(other.indptr)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        out_indices, out_data = [], []
+        
+        for i in range(n):
+            start, end = self.indptr[i], self.indptr[i + 1]
+            k = self.indices[start:end]
+            lengths = b_lengths[k]
+            total = int(lengths.sum())
+            if total == 0:
+                indptr[i + 1] = indptr[i]
+                continue
+            # Position of every entry of the selected B rows, concatenated
+            segment_starts = np.cumsum(lengths) - lengths
+            positions = np.arange(total) + np.repeat(other.indptr[k] - segment_starts, lengths)
+            cols = other.indices[positions]
+            products = other.data[positions] * np.repeat(self.data[start:end], lengths)
+            row_cols, inverse = np.unique(cols, return_inverse=True)
+            out_indices.append(row_cols)
+            out_data.append(np.bincount(inverse, weights=products, minlength=len(row_cols)).astype(dtype))
+            indptr[i + 1] = indptr[i] + len(row_cols)
+        
+        indices = np.concatenate(out_indices) if out_indices else np.empty(0, dtype=np.int64)
+        data = np.concatenate(out_data) if out_data else np.empty(0, dtype=dtype)
+        return CSRMatrix(indptr, indices, data, (n, m))
+    
+    def __matmul__(self, other):
+        if isinstance(other, (CSRMatrix, CSCMatrix)):
+            return self.matmul(other)
+        return self.matvec(other)
+
+class CSCMatrix:
+    """
+    Compressed Sparse Column matrix: column j's nonzeros are
+    data[indptr[j]:indptr[j+1]] at rows indices[indptr[j]:indptr[j+1]]
+    """
+    
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+        self._col_ids = None
+    
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        return cls(*_compress(np.asarray(cols), np.asarray(rows), np.asarray(values), shape[1]), shape)
+    
+    @classmethod
+    def from_dense(cls, M):
+        return CSRMatrix.from_dense(M).tocsc()
+    
+    @property
+    def nnz(self):
+        return len(self.data)
+    
+    def col_ids(self):
+        if self._col_ids is None:
+            self._col_ids = np.repeat(np.arange(self.shape[1]), np.diff(self.indptr))
+        return self._col_ids
+    
+    def to_dense(self):
+        M = np.zeros(self.shape, dtype=self.data.dtype)
+        M[self.indices, self.col_ids()] = self.data
+        return M
+    
+    def tocsr(self):
+        return CSRMatrix(*_compress(self.indices, self.col_ids(), self.data, self.shape[0]), self.shape)
+    
+    def matvec(self, x):
+        """SpMV as a scatter: y[indices] += data * x[column]"""
+        return np.bincount(self.indices, weights=self.data * x[self.col_ids()],
+                           minlength=self.shape[0]).astype(np.result_type(self.data, x), copy=False)
+    
+    def __matmul__(self, other):
+        if isinstance(other, (CSRMatrix, CSCMatrix)):
+            return self.tocsr().matmul(other)
+        return self.matvec(other)
 
 class MatrixOptimizationDemo:
     """
     Demonstrates cache-aware optimization techniques for matrix operations
     """
     
-    def __init__(self, sizes=[100, 300, 500, 1000]):
+    def __init__(self, sizes=[100, 300, 500, 1000], tuner=None, workers=None, strassen_cutoff=512,
+                 collect_perf=None):
         self.sizes = sizes
-        self.results = {
-            'naive': [],
-            'optimized': [],
-            'numpy_baseline': []
+        # Hardware counters re-run each case in a subprocess; on by default when perf exists
+        self.collect_perf = perf_available() if collect_perf is None else collect_perf
+        self.strassen_cutoff = strassen_cutoff
+        self.tuner = tuner or BlockSizeTuner()
+        self.workers = workers or os.cpu_count()
+        # Worker pools and shared-memory blocks live across calls, so the parallel
+        # variants time the multiply rather than pool start-up; see close()
+        self._pools = {}  # executor class -> (workers, executor); one live pool per backend
+        self._shm_blocks = {}  # 'A' / 'B' / 'C' -> SharedMemory, reused while shapes match
+        self._shm_layout = None
+        self._finalizer = weakref.finalize(self, _release_parallel_resources, self._pools, self._shm_blocks)
+        # key -> (label, function, largest size worth running; None = no limit)
+        self.implementations = {
+            'naive': ("Naive Implementation", self.matrix_multiply_naive, 500),
+            'optimized': ("Optimized Implementation", self.matrix_multiply_optimized, 500),
+            'row_axpy': ("Row-AXPY (i-k-j) Implementation", self.matrix_multiply_row_axpy, 1024),
+            'tiled': ("Tiled NumPy Implementation", self.matrix_multiply_tiled, None),
+            'autotuned': ("Auto-tuned Tiled Implementation", self.matrix_multiply_autotuned, None),
+            'parallel_threads': ("Parallel Tiled (threads)", self.matrix_multiply_parallel_threads, None),
+            'parallel_processes': ("Parallel Tiled (processes)", self.matrix_multiply_parallel_processes, None),
+            'strassen': ("Strassen (BLAS cutoff)", self.matrix_multiply_strassen, None),
+            'numpy_baseline': ("NumPy Baseline", lambda A, B: np.dot(A, B), None),
         }
+        self.results = {key: [] for key in self.implementations}
+        # Relative Frobenius error vs np.dot, per implementation and size
+        self.errors = {key: [] for key in self.implementations}
+        # Memory, throughput and counter measurements, per implementation and size
+        self.metrics = {key: [] for key in self.implementations}
+        self.scaling_results = []
+        self.out_of_core_results = []
+        self.sparse_results = []
+        self.precision_results = []
+        self.batched_results = []
     
-    def generate_matrices(self, size):
+    def generate_matrices(self, size, dtype=np.float64):
         """Generate random matrices for testing"""
         np.random.seed(42)  # For reproducible results
-        A = np.random.rand(size, size).astype(np.float64)
-        B = np.random.rand(size, size).astype(np.float64)
+        A = np.random.rand(size, size).astype(dtype)
+        B = np.random.rand(size, size).astype(dtype)
+        return A, B
+    
+    def generate_batch(self, batch, dim, dtype=np.float32):
+        """Stacks of `batch` small dim x dim matrices, shape (batch, dim, dim)"""
+        rng = np.random.default_rng(42)
+        A = rng.random((batch, dim, dim)).astype(dtype)
+        B = rng.random((batch, dim, dim)).astype(dtype)
         return A, B
     
     def matrix_multiply_naive(self, A, B):
@@ -45,14 +475,16 @@ class MatrixOptimizationDemo:
         
         return C
     
-    def matrix_multiply_optimized(self, A, B):
+    def matrix_multiply_optimized(self, A, B, block_size=64):
         """
         Cache-aware matrix multiplication using blocking/tiling
         Improves data locality by processing submatrices that fit in cache
         """
         n = A.shape[0]
         C = np.zeros((n, n), dtype=np.float64)
-        block_size = min(64, n)  # Choose block size based on cache size
+        # Interpreter overhead dominates here; BlockSizeTuner measures
+        # block sizes for the vectorized tiled path instead
+        block_size = min(block_size, n)
         
         for i0 in range(0, n, block_size):
             for j0 in range(0, n, block_size):
@@ -85,23 +517,578 @@ class MatrixOptimizationDemo:
         
         return C
     
-    def benchmark_implementation(self, func, A, B, name):
-        """Benchmark a single implementation"""
+    def matrix_multiply_row_axpy(self, A, B, out=None):
+        """
+        i-k-j order with the inner j loop vectorized as a row AXPY:
+        C[i, :] += A[i, k] * B[k, :], streaming contiguous rows of B and C
+        """
+        n, m = A.shape[0], B.shape[1]
+        C = out if out is not None else np.empty((n, m), dtype=np.result_type(A, B))
+        C.fill(0)
+        row = np.empty(m, dtype=C.dtype)
+        
+        for i in range(n):
+            C_i = C[i]
+            A_i = A[i]
+            for k in range(A.shape[1]):
+                np.multiply(B[k], A_i[k], out=row)
+                np.add(C_i, row, out=C_i)
+        
+        return C
+    
+    def matrix_multiply_tiled(self, A, B, block_size=256, loop_order='ijk', out=None):
+        """
+        Cache-blocked multiply where each tile product is a vectorized
+        block x block matmul on views, accumulated into preallocated C
+        through a reusable scratch tile (no per-tile temporaries).
+        loop_order is the nesting of the tile loops, outermost first
+        """
+        n, K, m = A.shape[0], A.shape[1], B.shape[1]
+        C = out if out is not None else np.empty((n, m), dtype=np.result_type(A, B))
+        C.fill(0)
+        scratch = np.empty((block_size, block_size), dtype=C.dtype)
+        starts = {'i': range(0, n, block_size), 'j': range(0, m, block_size),
+                  'k': range(0, K, block_size)}
+        
+        for tile in itertools.product(*(starts[axis] for axis in loop_order)):
+            origin = dict(zip(loop_order, tile))
+            i0, j0, k0 = origin['i'], origin['j'], origin['k']
+            i_end = min(i0 + block_size, n)
+            j_end = min(j0 + block_size, m)
+            k_end = min(k0 + block_size, K)
+            C_tile = C[i0:i_end, j0:j_end]
+            tmp = scratch[:i_end - i0, :j_end - j0]
+            np.matmul(A[i0:i_end, k0:k_end], B[k0:k_end, j0:j_end], out=tmp)
+            np.add(C_tile, tmp, out=C_tile)
+        
+        return C
+    
+    def matrix_multiply_autotuned(self, A, B, out=None):
+        """Tiled multiply using the tuner's measured best block size and loop order"""
+        config = self.tuner.tune(self, A.shape[0], A.dtype)
+        return self.matrix_multiply_tiled(A, B, block_size=config['block_size'],
+                                          loop_order=config['loop_order'], out=out)
+    
+    def _pool(self, executor, workers):
+        """This backend's pool, replaced (old one shut down) when the worker count changes"""
+        current = self._pools.get(executor)
+        if current is not None and current[0] == workers:
+            return current[1]
+        if current is not None:
+            current[1].shutdown()
+        kwargs = {'initializer': _init_pool_worker} if executor is ProcessPoolExecutor else {}
+        pool = executor(max_workers=workers, **kwargs)
+        self._pools[executor] = (workers, pool)
+        return pool
+    
+    def _shared_blocks(self, shapes, dtype):
+        layout = (tuple(shapes.items()), dtype.str)
+        if layout != self._shm_layout or not self._shm_blocks:
+            for shm in self._shm_blocks.values():
+                shm.close()
+                shm.unlink()
+            self._shm_blocks.clear()
+            for name, shape in shapes.items():
+                nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+                self._shm_blocks[name] = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._shm_layout = layout
+        return self._shm_blocks
+    
+    def close(self):
+        """
+        Shut down the reused worker pools and unlink the shared-memory blocks.
+        Runs at interpreter exit too, but a multiprocessing child must call it:
+        exit joins the pool's worker processes first
+        """
+        _release_parallel_resources(self._pools, self._shm_blocks)
+        self._shm_layout = None
+    
+    def matrix_multiply_parallel_threads(self, A, B, workers=None, block_size=None):
+        """
+        Output tiles split round-robin across a thread pool; NumPy releases
+        the GIL inside each block product, so tiles run concurrently
+        """
+        workers = workers or self.workers
+        block_size = block_size or _parallel_block_size(A.shape[0], workers)
+        C = np.empty((A.shape[0], B.shape[1]), dtype=np.result_type(A, B))
+        tiles = _output_tiles(A.shape[0], B.shape[1], block_size)
+        
+        pool = self._pool(ThreadPoolExecutor, workers)
+        with _single_threaded_blas():
+            chunks = [tiles[w::workers] for w in range(workers)]
+            list(pool.map(lambda chunk: _compute_tiles(A, B, C, chunk, block_size), chunks))
+        
+        return C
+    
+    def matrix_multiply_parallel_processes(self, A, B, workers=None, block_size=None):
+        """
+        Output tiles split across worker processes that map A, B and C from
+        multiprocessing.shared_memory instead of pickling the matrices
+        """
+        workers = workers or self.workers
+        block_size = block_size or _parallel_block_size(A.shape[0], workers)
+        dtype = np.result_type(A, B)
+        shapes = {'A': A.shape, 'B': B.shape, 'C': (A.shape[0], B.shape[1])}
+        blocks = self._shared_blocks(shapes, dtype)
+        views = {name: np.ndarray(shapes[name], dtype=dtype, buffer=blocks[name].buf) for name in shapes}
+        views['A'][:] = A
+        views['B'][:] = B
+        specs = {name: (blocks[name].name, shapes[name], dtype.str) for name in shapes}
+        
+        tiles = _output_tiles(A.shape[0], B.shape[1], block_size)
+        pool = self._pool(ProcessPoolExecutor, workers)
+        futures = [pool.submit(_compute_shared_tiles, specs, tiles[w::workers], block_size)
+                   for w in range(workers)]
+        for future in futures:
+            future.result()
+        C = views['C'].copy()
+        del views
+        return C
+    
+    def matrix_multiply_strassen(self, A, B, cutoff=None):
+        """
+        Strassen's 7-multiplication recursion on quadrants, falling back to
+        np.dot at or below `cutoff`. Sizes are zero-padded to cutoff-ish * 2^depth
+        so every level splits evenly; all scratch is allocated once up front.
+        Extra memory is about padded^2 elements across all levels
+        """
+        cutoff = cutoff or self.strassen_cutoff
+        n = max(A.shape[0], A.shape[1], B.shape[1])
+        dtype = np.result_type(A, B)
+        if n <= cutoff:
+            return np.dot(A, B)
+        
+        depth = 0
+        while -(-n // 2**depth) > cutoff:
+            depth += 1
+        padded = -(-n // 2**depth) * 2**depth
+        
+        A_pad = np.zeros((padded, padded), dtype=dtype)
+        B_pad = np.zeros((padded, padded), dtype=dtype)
+        A_pad[:A.shape[0], :A.shape[1]] = A
+        B_pad[:B.shape[0], :B.shape[1]] = B
+        C_pad = np.empty((padded, padded), dtype=dtype)
+        
+        # One (S, T, M) triple per recursion level: operand sums and product
+        scratch = {}
+        for level in range(1, depth + 1):
+            half = padded >> level
+            scratch[half] = tuple(np.empty((half, half), dtype=dtype) for _ in range(3))
+        
+        self._strassen(A_pad, B_pad, C_pad, cutoff, scratch)
+        return np.ascontiguousarray(C_pad[:A.shape[0], :B.shape[1]])
+    
+    def _strassen(self, A, B, C, cutoff, scratch):
+        n = A.shape[0]
+        if n <= cutoff:
+            np.dot(A, B, out=C)
+            return
+        
+        h = n // 2
+        S, T, M = scratch[h]
+        A11, A12, A21, A22 = A[:h, :h], A[:h, h:], A[h:, :h], A[h:, h:]
+        B11, B12, B21, B22 = B[:h, :h], B[:h, h:], B[h:, :h], B[h:, h:]
+        C11, C12, C21, C22 = C[:h, :h], C[:h, h:], C[h:, :h], C[h:, h:]
+        
+        # M1 = (A11 + A22)(B11 + B22) -> C11, C22
+        np.add(A11, A22, out=S)
+        np.add(B11, B22, out=T)
+        self._strassen(S, T, M, cutoff, scratch)
+        C11[:] = M
+        C22[:] = M
+        # M2 = (A21 + A22) B11 -> C21, -C22
+        np.add(A21, A22, out=S)
+        self._strassen(S, B11, M, cutoff, scratch)
+        C21[:] = M
+        C22 -= M
+        # M3 = A11 (B12 - B22) -> C12, C22
+        np.subtract(B12, B22, out=T)
+        self._strassen(A11, T, M, cutoff, scratch)
+        C12[:] = M
+        C22 += M
+        # M4 = A22 (B21 - B11) -> C11, C21
+        np.subtract(B21, B11, out=T)
+        self._strassen(A22, T, M, cutoff, scratch)
+        C11 += M
+        C21 += M
+        # M5 = (A11 + A12) B22 -> -C11, C12
+        np.add(A11, A12, out=S)
+        self._strassen(S, B22, M, cutoff, scratch)
+        C11 -= M
+        C12 += M
+        # M6 = (A21 - A11)(B11 + B12) -> C22
+        np.subtract(A21, A11, out=S)
+        np.add(B11, B12, out=T)
+        self._strassen(S, T, M, cutoff, scratch)
+        C22 += M
+        # M7 = (A12 - A22)(B21 + B22) -> C11
+        np.subtract(A12, A22, out=S)
+        np.add(B21, B22, out=T)
+        self._strassen(S, T, M, cutoff, scratch)
+        C11 += M
+    
+    def generate_matrices_on_disk(self, size, directory, dtype=np.float32, chunk_rows=1024):
+        """
+        Write random A and B as .npy files in row chunks, so matrices larger
+        than RAM can be created. Existing files of the right shape are reused
+        """
+        os.makedirs(directory, exist_ok=True)
+        rng = np.random.default_rng(42)
+        paths = []
+        for name in ('A', 'B'):
+            path = os.path.join(directory, f"{name}_{size}_{np.dtype(dtype).name}.npy")
+            paths.append(path)
+            if os.path.exists(path):
+                existing = np.load(path, mmap_mode='r')
+                if existing.shape == (size, size) and existing.dtype == dtype:
+                    continue
+            matrix = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(size, size))
+            for r0 in range(0, size, chunk_rows):
+                r_end = min(r0 + chunk_rows, size)
+                matrix[r0:r_end] = rng.random((r_end - r0, size), dtype=np.float32).astype(dtype, copy=False)
+            matrix.flush()
+            del matrix
+        return tuple(paths)
+    
+    def matrix_multiply_out_of_core(self, a_path, b_path, c_path, memory_budget=2 * 2**30,
+                                    panel_cols=2048):
+        """
+        C = A @ B over memory-mapped .npy files. A row panel of A stays
+        resident while column panels of B stream past it, so A is read once
+        and B once per A panel: the panel is made as tall as the budget
+        allows to minimize B re-reads. Returns I/O and throughput stats
+        """
+        A = np.load(a_path, mmap_mode='r')
+        B = np.load(b_path, mmap_mode='r')
+        n, K = A.shape
+        m = B.shape[1]
+        dtype = np.result_type(A, B)
+        itemsize = dtype.itemsize
+        C = np.lib.format.open_memmap(c_path, mode='w+', dtype=dtype, shape=(n, m))
+        
+        # Budget = A panel (rows x K) + B panel (K x cols) + C tile (rows x cols);
+        # B panels get at most a quarter so most of it goes to the A panel
+        panel_cols = max(1, min(m, panel_cols, memory_budget // (4 * K * itemsize)))
+        panel_rows = (memory_budget - K * panel_cols * itemsize) // ((K + panel_cols) * itemsize)
+        if panel_rows < 1:
+            raise MemoryError("memory_budget too small for one row of A plus a panel of B")
+        panel_rows = min(n, int(panel_rows))
+        
+        stats = {'size': n, 'dtype': dtype.name, 'memory_budget': memory_budget,
+                 'panel_rows': panel_rows, 'panel_cols': panel_cols,
+                 'b_passes': -(-n // panel_rows), 'bytes_read': 0, 'bytes_written': 0,
+                 'read_seconds': 0.0, 'write_seconds': 0.0, 'compute_seconds': 0.0}
+        C_tile = np.empty((panel_rows, panel_cols), dtype=dtype)
+        start_time = time.perf_counter()
+        
+        for i0 in range(0, n, panel_rows):
+            i_end = min(i0 + panel_rows, n)
+            t0 = time.perf_counter()
+            A_panel = np.array(A[i0:i_end], dtype=dtype)
+            stats['read_seconds'] += time.perf_counter() - t0
+            stats['bytes_read'] += A_panel.nbytes
+            
+            for j0 in range(0, m, panel_cols):
+                j_end = min(j0 + panel_cols, m)
+                t0 = time.perf_counter()
+                B_panel = np.array(B[:, j0:j_end], dtype=dtype)
+                t1 = time.perf_counter()
+                tile = C_tile[:i_end - i0, :j_end - j0]
+                np.matmul(A_panel, B_panel, out=tile)
+                t2 = time.perf_counter()
+                C[i0:i_end, j0:j_end] = tile
+                t3 = time.perf_counter()
+                stats['read_seconds'] += t1 - t0
+                stats['compute_seconds'] += t2 - t1
+                stats['write_seconds'] += t3 - t2
+                stats['bytes_read'] += B_panel.nbytes
+                stats['bytes_written'] += tile.nbytes
+        
+        t0 = time.perf_counter()
+        C.flush()
+        stats['write_seconds'] += time.perf_counter() - t0
+        stats['seconds'] = time.perf_counter() - start_time
+        stats['io_gbs'] = (stats['bytes_read'] + stats['bytes_written']) / stats['seconds'] / 1e9
+        stats['gflops'] = 2 * n * K * m / stats['seconds'] / 1e9
+        del C
+        return stats
+    
+    def run_out_of_core_benchmark(self, size, directory, memory_budget=2 * 2**30, dtype=np.float32):
+        """Multiply two on-disk size x size matrices and report I/O volume and throughput"""
+        print(f"\nOut-of-core multiply for {size}x{size} {np.dtype(dtype).name} "
+              f"(budget {memory_budget / 2**20:.0f} MiB)")
+        a_path, b_path = self.generate_matrices_on_disk(size, directory, dtype)
+        c_path = os.path.join(directory, f"C_{size}_{np.dtype(dtype).name}.npy")
+        stats = self.matrix_multiply_out_of_core(a_path, b_path, c_path, memory_budget)
+        
+        # Verify correctness (only when the inputs fit comfortably in RAM)
+        if size <= 2048:
+            expected = np.dot(np.load(a_path), np.load(b_path))
+            assert np.allclose(np.load(c_path), expected, rtol=1e-4), "out-of-core result mismatch"
+            print("✓ Results verified correct")
+        
+        print(f"Panels: {stats['panel_rows']} rows of A x {stats['panel_cols']} cols of B "
+              f"({stats['b_passes']} passes over B)")
+        print(f"Read {stats['bytes_read'] / 1e9:.2f} GB, wrote {stats['bytes_written'] / 1e9:.2f} GB "
+              f"in {stats['seconds']:.2f}s: {stats['io_gbs']:.2f} GB/s I/O, {stats['gflops']:.2f} GFLOP/s")
+        self.out_of_core_results.append(stats)
+        return stats
+    
+    def matrix_multiply_mixed(self, A, B, accumulate_dtype=np.float32, out_dtype=None):
+        """
+        Multiply matrices stored in A/B's dtype, accumulating in
+        accumulate_dtype (e.g. float16 storage, float32 accumulation).
+        Inputs are widened inside matmul, so BLAS does the accumulation
+        """
+        C = np.matmul(A, B, dtype=accumulate_dtype)
+        return C if out_dtype is None else C.astype(out_dtype, copy=False)
+    
+    def run_precision_benchmark(self, size=512, repeats=3,
+                                modes=((np.float64, np.float64), (np.float32, np.float32),
+                                       (np.float32, np.float64), (np.float16, np.float16),
+                                       (np.float16, np.float32))):
+        """
+        Time each (storage, accumulation) dtype pair and report two relative
+        errors: against the float64 product of the original inputs (storage
+        rounding + accumulation) and against the float64 product of the
+        rounded inputs (accumulation only)
+        """
+        A, B = self.generate_matrices(size)
+        exact = np.dot(A, B)
+        print(f"\nMixed-precision benchmark for {size}x{size} matrices")
+        
+        for storage, accumulate in modes:
+            A_s, B_s = A.astype(storage), B.astype(storage)
+            rounded_exact = np.dot(A_s.astype(np.float64), B_s.astype(np.float64))
+            C = self.matrix_multiply_mixed(A_s, B_s, accumulate)
+            elapsed = min(self._time_call(self.matrix_multiply_mixed, A_s, B_s, accumulate)
+                          for _ in range(repeats))
+            row = {
+                'storage': np.dtype(storage).name, 'accumulate': np.dtype(accumulate).name,
+                'size': size, 'seconds': elapsed, 'gflops': 2 * size**3 / elapsed / 1e9,
+                'total_error': float(np.linalg.norm(C - exact) / np.linalg.norm(exact)),
+                'accumulation_error': float(np.linalg.norm(C - rounded_exact) / np.linalg.norm(rounded_exact)),
+            }
+            self.precision_results.append(row)
+            print(f"{row['storage']:>8} storage / {row['accumulate']:<8} accumulate: "
+                  f"{row['gflops']:8.2f} GFLOP/s, rel. error {row['total_error']:.2e}")
+        
+        return self.precision_results
+    
+    def batched_matmul(self, A, B, method='matmul', out=None):
+        """
+        Multiply stacks A[b] @ B[b]. 'matmul' broadcasts over the batch axis,
+        'einsum' contracts explicitly, 'loop' is the per-matrix Python baseline
+        """
+        if out is None:
+            out = np.empty((A.shape[0], A.shape[1], B.shape[2]), dtype=np.result_type(A, B))
+        if method == 'matmul':
+            np.matmul(A, B, out=out)
+        elif method == 'einsum':
+            np.einsum('bij,bjk->bik', A, B, out=out)
+        elif method == 'loop':
+            for b in range(A.shape[0]):
+                np.matmul(A[b], B[b], out=out[b])
+        else:
+            raise ValueError(f"Unknown batched method: {method}")
+        return out
+    
+    def run_batched_benchmark(self, batch_sizes=(1000, 10000, 100000), dim=16,
+                              dtypes=(np.float32, np.float64), methods=('matmul', 'einsum', 'loop'),
+                              repeats=3):
+        """Throughput (matrices/s and GFLOP/s) per dtype, batch size and method"""
+        print(f"\nBatched benchmark for {dim}x{dim} matrices")
+        for dtype in dtypes:
+            for batch in batch_sizes:
+                A, B = self.generate_batch(batch, dim, dtype)
+                out = np.empty((batch, dim, dim), dtype=dtype)
+                reference = np.matmul(A, B)
+                for method in methods:
+                    self.batched_matmul(A, B, method, out)
+                    assert np.allclose(out, reference, rtol=1e-4), method
+                    elapsed = min(self._time_call(self.batched_matmul, A, B, method, out)
+                                  for _ in range(repeats))
+                    row = {'dtype': np.dtype(dtype).name, 'batch': batch, 'dim': dim, 'method': method,
+                           'seconds': elapsed, 'matrices_per_s': batch / elapsed,
+                           'gflops': 2 * batch * dim**3 / elapsed / 1e9}
+                    self.batched_results.append(row)
+                    print(f"{row['dtype']:>8} batch={batch:<7} {method:<7} "
+                          f"{row['matrices_per_s']:12.0f} matrices/s {row['gflops']:8.2f} GFLOP/s")
+        
+        return self.batched_results
+    
+    def generate_sparse_matrix(self, size, density, seed=42, dtype=np.float64):
+        """CSR matrix with exactly round(density * size^2) uniformly placed nonzeros"""
+        rng = np.random.default_rng(seed)
+        nnz = int(round(density * size * size))
+        flat = np.unique(rng.integers(0, size * size, nnz))
+        # Collisions are rare at low density; top up until nnz is exact
+        while len(flat) < nnz:
+            flat = np.unique(np.concatenate([flat, rng.integers(0, size * size, nnz - len(flat))]))
+        rows, cols = np.divmod(flat, size)
+        values = rng.random(len(flat)).astype(dtype)
+        return CSRMatrix.from_coo(rows, cols, values, (size, size))
+    
+    def run_sparse_benchmark(self, sizes=(1000, 2000, 4000), densities=(0.0001, 0.001, 0.01, 0.05),
+                             dense_limit=4096, repeats=3):
+        """
+        Time SpMV and SpGEMM against dense NumPy for each (n, density) and
+        report the highest density at which the sparse kernel still wins
+        """
+        print("\nSparse vs dense benchmark")
+        for size in sizes:
+            x = np.random.default_rng(0).random(size)
+            for density in densities:
+                A = self.generate_sparse_matrix(size, density, seed=1)
+                B = self.generate_sparse_matrix(size, density, seed=2)
+                row = {'size': size, 'density': density, 'nnz': A.nnz,
+                       'spmv': min(self._time_call(A.matvec, x) for _ in range(repeats)),
+                       'spgemm': min(self._time_call(A.matmul, B) for _ in range(repeats)),
+                       'dense_matvec': None, 'dense_matmul': None}
+                
+                if size <= dense_limit:
+                    A_dense, B_dense = A.to_dense(), B.to_dense()
+                    row['dense_matvec'] = min(self._time_call(np.dot, A_dense, x) for _ in range(repeats))
+                    row['dense_matmul'] = min(self._time_call(np.dot, A_dense, B_dense) for _ in range(repeats))
+                    # Verify correctness (only for smaller matrices)
+                    if size <= 1000:
+                        assert np.allclose(A.matvec(x), A_dense @ x)
+                        assert np.allclose(A.matmul(B).to_dense(), A_dense @ B_dense)
+                        assert np.allclose(A.tocsc().matvec(x), A_dense @ x)
+                
+                self.sparse_results.append(row)
+                print(f"n={size:<6} density={density:<8} SpMV {row['spmv']:.5f}s "
+                      f"SpGEMM {row['spgemm']:.4f}s dense matmul "
+                      f"{row['dense_matmul'] if row['dense_matmul'] is not None else float('nan'):.4f}s")
+        
+        return self.sparse_results
+    
+    def sparse_crossover(self):
+        """Per size, the highest tested density at which each sparse kernel beats dense"""
+        crossover = {}
+        for row in self.sparse_results:
+            entry = crossover.setdefault(row['size'], {'spmv': None, 'spgemm': None})
+            for kernel, dense in (('spmv', 'dense_matvec'), ('spgemm', 'dense_matmul')):
+                if row[dense] is not None and row[kernel] < row[dense]:
+                    entry[kernel] = max(entry[kernel] or 0, row['density'])
+        return crossover
+    
+    def run_scaling_benchmark(self, size=None, max_workers=None, repeats=3):
+        """
+        Strong scaling: fixed problem size, 1..max_workers workers.
+        speedup = T(1) / T(p), efficiency = speedup / p
+        """
+        size = size or max(self.sizes)
+        max_workers = max_workers or self.workers
+        A, B = self.generate_matrices(size)
+        backends = {'threads': self.matrix_multiply_parallel_threads,
+                    'processes': self.matrix_multiply_parallel_processes}
+        
+        print(f"\nStrong scaling for {size}x{size} matrices (1..{max_workers} workers)")
+        for backend, func in backends.items():
+            baseline = None
+            for workers in range(1, max_workers + 1):
+                func(A, B, workers=workers)  # untimed: starts this worker count's pool
+                elapsed = min(self._time_call(func, A, B, workers=workers) for _ in range(repeats))
+                baseline = baseline or elapsed
+                speedup = baseline / elapsed
+                self.scaling_results.append({
+                    'backend': backend, 'size': size, 'workers': workers,
+                    'seconds': elapsed, 'speedup': speedup, 'efficiency': speedup / workers
+                })
+                print(f"{backend:<10} workers={workers:<3} {elapsed:.4f}s "
+                      f"speedup={speedup:.2f}x efficiency={speedup / workers:.0%}")
+        
+        return self.scaling_results
+    
+    def _time_call(self, func, *args, **kwargs):
+        start_time = time.perf_counter()
+        func(*args, **kwargs)
+        return time.perf_counter() - start_time
+    
+    def benchmark_implementation(self, func, A, B, name, key=None, repeats=1):
+        """Benchmark a single implementation (best of `repeats` timed runs)"""
         print(f"Running {name} for {A.shape[0]}x{A.shape[0]} matrices...")
+        self._prepare(func, A)
         
-        # Warm-up run
-        _ = func(A, B)
+        # Warm-up run, instrumented so tracing does not skew the timed run.
+        # The size-limited pure-Python loops skip it: they need no warming, and
+        # tracemalloc hooks every float they box (10-20x slower), so for them
+        # only RSS is sampled, around the timed runs
+        interpreted = key is not None and self.implementations[key][2] is not None
+        rss = PeakRSSSampler()
+        traced_peak = None
+        if not interpreted:
+            tracemalloc.start()
+            with rss:
+                _ = func(A, B)
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
         
         # Actual timing
-        start_time = time.perf_counter()
-        result = func(A, B)
-        end_time = time.perf_counter()
+        self.last_times = []
+        with rss if interpreted else contextlib.nullcontext():
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                result = func(A, B)
+                end_time = time.perf_counter()
+                self.last_times.append(end_time - start_time)
         
-        execution_time = end_time - start_time
+        execution_time = min(self.last_times)
         print(f"{name} completed in {execution_time:.4f} seconds")
         
+        if key is not None:
+            self.metrics[key].append(self._collect_metrics(key, A, execution_time, rss.peak, traced_peak))
+        
         return execution_time, result
     
+    def _prepare(self, func, A):
+        """One-off setup kept out of the timing and memory metrics: block-size tuning"""
+        if func == self.matrix_multiply_autotuned:
+            self.tuner.tune(self, A.shape[0], A.dtype)
+    
+    def _collect_metrics(self, key, A, seconds, peak_rss, traced_peak):
+        """
+        GFLOP/s counts 2n^3 flops for every variant (Strassen does fewer, so
+        its figure is "effective"). Bandwidth is reported twice: a lower
+        bound from compulsory traffic (read A, B, write C) and, with perf,
+        LLC misses * line size
+        """
+        n = A.shape[0]
+        compulsory_bytes = 3 * n * n * A.itemsize
+        metrics = {
+            'seconds': seconds,
+            'gflops': 2 * n**3 / seconds / 1e9 if seconds else None,
+            'min_bandwidth_gbs': compulsory_bytes / seconds / 1e9 if seconds else None,
+            'peak_rss_mb': peak_rss / 2**20,
+            'tracemalloc_peak_mb': traced_peak / 2**20 if traced_peak is not None else None,
+            'perf': None,
+            'llc_bandwidth_gbs': None,
+        }
+        
+        if self.collect_perf:
+            counters = self._perf_counters(key, n)
+            metrics['perf'] = counters
+            misses = counters.get('LLC-load-misses') or counters.get('cache-misses')
+            if misses is not None and seconds:
+                metrics['llc_bandwidth_gbs'] = misses * cache_line_size() / seconds / 1e9
+        
+        return metrics
+    
+    def _perf_counters(self, key, size):
+        """
+        Counters for one run of `key`, minus a run that only builds the
+        matrices, so setup and interpreter start-up are not attributed to it
+        """
+        setup = (f"import sys; sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r}); "
+                 f"from hpc_optimization import BlockSizeTuner, MatrixOptimizationDemo; "
+                 f"demo = MatrixOptimizationDemo([{size}], collect_perf=False, "
+                 f"tuner=BlockSizeTuner(cache_file={self.tuner.cache_file!r})); "
+                 f"A, B = demo.generate_matrices({size})")
+        full = perf_stat(setup + f"; demo.implementations[{key!r}][1](A, B)")
+        baseline = perf_stat(setup)
+        return {event: max(count - baseline.get(event, 0), 0) for event, count in full.items()}
+    
     def run_comprehensive_benchmark(self):
         """Run benchmarks for all matrix sizes and implementations"""
         print("Starting comprehensive benchmark...")
@@ -112,58 +1099,50 @@ class MatrixOptimizationDemo:
             print(f"{'='*50}")
             
             A, B = self.generate_matrices(size)
+            outputs = {}
             
-            # Skip naive implementation for large matrices (too slow)
-            if size <= 500:
-                time_naive, result_naive = self.benchmark_implementation(
-                    self.matrix_multiply_naive, A, B, "Naive Implementation"
-                )
-                self.results['naive'].append(time_naive)
-            else:
-                self.results['naive'].append(None)
+            for key, (label, func, max_size) in self.implementations.items():
+                # Skip pure-Python loops for large matrices (too slow)
+                if max_size is not None and size > max_size:
+                    self.results[key].append(None)
+                    self.metrics[key].append(None)
+                    continue
+                elapsed, outputs[key] = self.benchmark_implementation(func, A, B, label, key)
+                self.results[key].append(elapsed)
             
-            # Optimized implementation
-            time_opt, result_opt = self.benchmark_implementation(
-                self.matrix_multiply_optimized, A, B, "Optimized Implementation"
-            )
-            self.results['optimized'].append(time_opt)
-            
-            # NumPy baseline for comparison
-            time_numpy, result_numpy = self.benchmark_implementation(
-                lambda A, B: np.dot(A, B), A, B, "NumPy Baseline"
-            )
-            self.results['numpy_baseline'].append(time_numpy)
+            reference = outputs['numpy_baseline']
+            reference_norm = np.linalg.norm(reference)
+            for key in self.implementations:
+                result = outputs.get(key)
+                self.errors[key].append(
+                    None if result is None else float(np.linalg.norm(result - reference) / reference_norm))
             
             # Verify correctness (only for smaller matrices)
             if size <= 300:
-                if size <= 500 and self.results['naive'][-1] is not None:
-                    assert np.allclose(result_naive, result_numpy, rtol=1e-10)
-                assert np.allclose(result_opt, result_numpy, rtol=1e-10)
+                for key, result in outputs.items():
+                    assert np.allclose(result, reference, rtol=1e-10), key
                 print("✓ Results verified correct")
+        
+        self.run_scaling_benchmark()
+    
+    def _series(self, key):
+        """Sizes and times for one implementation, skipping sizes it did not run"""
+        points = [(size, t) for size, t in zip(self.sizes, self.results[key]) if t is not None]
+        return [p[0] for p in points], [p[1] for p in points]
     
-    def visualize_results(self):
+    def visualize_results(self, output='matrix_optimization_results.png', dpi=300, show=True):
         """Generate performance visualization"""
-        plt.figure(figsize=(12, 8))
-        
-        # Filter out None values for plotting
-        valid_sizes = []
-        naive_times = []
-        opt_times = []
-        numpy_times = []
-        
-        for i, size in enumerate(self.sizes):
-            if self.results['naive'][i] is not None:
-                valid_sizes.append(size)
-                naive_times.append(self.results['naive'][i])
-                opt_times.append(self.results['optimized'][i])
-                numpy_times.append(self.results['numpy_baseline'][i])
+        plt.figure(figsize=(18, 8))
         
         # Plot performance comparison
-        plt.subplot(2, 2, 1)
-        if naive_times:
-            plt.plot(valid_sizes, naive_times, 'r-o', label='Naive Implementation')
-        plt.plot(self.sizes, self.results['optimized'], 'g-s', label='Cache-Optimized')
-        plt.plot(self.sizes, self.results['numpy_baseline'], 'b-^', label='NumPy Baseline')
+        plt.subplot(2, 3, 1)
+        styles = {'naive': 'r-o', 'optimized': 'g-s', 'row_axpy': 'm-d',
+                  'tiled': 'c-v', 'autotuned': 'y-p', 'parallel_threads': 'k-x',
+                  'parallel_processes': 'k--+', 'strassen': 'r--*', 'numpy_baseline': 'b-^'}
+        for key, (label, _, _) in self.implementations.items():
+            sizes, times = self._series(key)
+            if times:
+                plt.plot(sizes, times, styles.get(key, '-o'), label=label)
         plt.xlabel('Matrix Size')
         plt.ylabel('Execution Time (seconds)')
         plt.title('Matrix Multiplication Performance Comparison')
@@ -172,45 +1151,95 @@ class MatrixOptimizationDemo:
         plt.yscale('log')
         
         # Speedup comparison
-        plt.subplot(2, 2, 2)
-        if naive_times:
-            speedup = [n/o for n, o in zip(naive_times, opt_times)]
-            plt.plot(valid_sizes, speedup, 'g-o', label='Optimized vs Naive')
+        plt.subplot(2, 3, 2)
+        naive = dict(zip(*self._series('naive')))
+        sizes, opt_times = self._series('optimized')
+        speedup = [(s, naive[s] / t) for s, t in zip(sizes, opt_times) if s in naive]
+        if speedup:
+            plt.plot(*zip(*speedup), 'g-o', label='Optimized vs Naive')
         
-        numpy_speedup = [o/n for o, n in zip(self.results['optimized'], self.results['numpy_baseline'])]
-        plt.plot(self.sizes, numpy_speedup, 'r-s', label='Optimized vs NumPy')
+        numpy_times = dict(zip(*self._series('numpy_baseline')))
+        sizes, tiled_times = self._series('tiled')
+        ratio = [(s, t / numpy_times[s]) for s, t in zip(sizes, tiled_times) if s in numpy_times]
+        if ratio:
+            plt.plot(*zip(*ratio), 'r-s', label='Tiled vs NumPy')
         plt.xlabel('Matrix Size')
         plt.ylabel('Speedup Factor')
         plt.title('Performance Speedup Analysis')
         plt.legend()
         plt.grid(True)
         
-        # Memory access pattern visualization
-        plt.subplot(2, 2, 3)
-        cache_sizes = [32, 64, 128, 256]  # KB
-        efficiency = [0.3, 0.7, 0.85, 0.9]  # Simulated cache efficiency
-        plt.bar(range(len(cache_sizes)), efficiency, 
-                color=['red', 'yellow', 'lightgreen', 'green'])
-        plt.xlabel('Cache Block Size (KB)')
-        plt.ylabel('Cache Hit Rate')
+        # Measured block-size sweep from the auto-tuner (largest tuned size)
+        plt.subplot(2, 3, 3)
+        tuned = [self.tuner.configs.get(f"{size}:float64") for size in self.sizes]
+        tuned = [config for config in tuned if config]
+        if tuned:
+            best_by_block = {}
+            for trial in tuned[-1]['trials']:
+                block = trial['block_size']
+                best_by_block[block] = max(best_by_block.get(block, 0), trial['gflops'])
+            blocks = sorted(best_by_block)
+            # Working set of one A, B and C tile
+            tile_kb = [3 * b * b * 8 // 1024 for b in blocks]
+            plt.bar(range(len(blocks)), [best_by_block[b] for b in blocks], color='green')
+            plt.xticks(range(len(blocks)), [f"{b}\n{kb}KB" for b, kb in zip(blocks, tile_kb)])
+        plt.xlabel('Block Size (tile working set)')
+        plt.ylabel('GFLOP/s (measured)')
         plt.title('Cache Efficiency by Block Size')
-        plt.xticks(range(len(cache_sizes)), cache_sizes)
         
         # Complexity analysis
-        plt.subplot(2, 2, 4)
+        plt.subplot(2, 3, 4)
         theoretical_n3 = [size**3 / 1e9 for size in self.sizes]
-        actual_times = self.results['optimized']
+        sizes, actual_times = self._series('tiled')
         plt.plot(self.sizes, theoretical_n3, 'r--', label='O(n³) theoretical')
-        plt.plot(self.sizes, actual_times, 'g-o', label='Actual performance')
+        plt.plot(sizes, actual_times, 'g-o', label='Actual performance (tiled)')
         plt.xlabel('Matrix Size')
         plt.ylabel('Relative Time')
         plt.title('Complexity Analysis')
         plt.legend()
         plt.grid(True)
         
+        # Achieved throughput (measured)
+        plt.subplot(2, 3, 5)
+        for key, (label, _, _) in self.implementations.items():
+            points = [(size, m['gflops']) for size, m in zip(self.sizes, self.metrics[key])
+                      if m and m['gflops']]
+            if points:
+                plt.plot(*zip(*points), styles.get(key, '-o'), label=label)
+        plt.xlabel('Matrix Size')
+        plt.ylabel('GFLOP/s')
+        plt.title('Achieved Throughput')
+        plt.yscale('log')
+        plt.grid(True)
+        
+        # Memory footprint at the largest size each implementation ran
+        plt.subplot(2, 3, 6)
+        labels, rss, traced, misses = [], [], [], []
+        for key in self.implementations:
+            measured = [m for m in self.metrics[key] if m]
+            if measured:
+                labels.append(key)
+                rss.append(measured[-1]['peak_rss_mb'])
+                traced.append(measured[-1]['tracemalloc_peak_mb'])
+                misses.append((measured[-1]['perf'] or {}).get('LLC-load-misses'))
+        x = np.arange(len(labels))
+        plt.bar(x - 0.2, rss, width=0.4, label='Peak RSS')
+        # No bar for the pure-Python loops, which are not traced
+        plt.bar(x + 0.2, [np.nan if t is None else t for t in traced], width=0.4,
+                label='Allocated (tracemalloc)')
+        for i, miss in enumerate(misses):
+            if miss is not None:
+                plt.annotate(f"{miss:.1e} LLC miss", (x[i], rss[i]), ha='center', fontsize=7, rotation=90)
+        plt.xticks(x, labels, rotation=45, ha='right')
+        plt.ylabel('Memory (MB)')
+        plt.title('Memory per Implementation (largest size)')
+        plt.legend()
+        
         plt.tight_layout()
-        plt.savefig('matrix_optimization_results.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(output, dpi=dpi, bbox_inches='tight')
+        if show:
+            plt.show()
+        plt.close()
     
     def generate_report_data(self):
         """Generate data for the report"""
@@ -218,13 +1247,28 @@ class MatrixOptimizationDemo:
             'sizes': self.sizes,
             'naive_times': self.results['naive'],
             'optimized_times': self.results['optimized'],
+            'row_axpy_times': self.results['row_axpy'],
+            'tiled_times': self.results['tiled'],
+            'autotuned_times': self.results['autotuned'],
+            'tuned_configs': {size: self.tuner.configs.get(f"{size}:float64") for size in self.sizes},
+            'parallel_thread_times': self.results['parallel_threads'],
+            'parallel_process_times': self.results['parallel_processes'],
+            'scaling': self.scaling_results,
+            'strassen_times': self.results['strassen'],
+            'errors': self.errors,
+            'metrics': self.metrics,
+            'out_of_core': self.out_of_core_results,
+            'sparse': self.sparse_results,
+            'sparse_crossover': self.sparse_crossover(),
+            'precision': self.precision_results,
+            'batched': self.batched_results,
             'numpy_times': self.results['numpy_baseline']
         }
         
         # Calculate speedups where possible
         speedups = []
         for i in range(len(self.sizes)):
-            if self.results['naive'][i] is not None:
+            if self.results['naive'][i] is not None and self.results['optimized'][i] is not None:
                 speedup = self.results['naive'][i] / self.results['optimized'][i]
                 speedups.append(f"{speedup:.2f}x")
             else:
@@ -234,8 +1278,285 @@ class MatrixOptimizationDemo:
         
         return report_data
 
-def main():
+def _exit_on_sigterm(signum, frame):
+    sys.exit(128 + signum)
+
+def _run_case_worker(conn, key, size, repeats, collect_perf, tuner_cache, verify_limit):
+    """
+    Child-process body for one (implementation, size) case of the CLI sweep.
+    It leads its own process group, so a timeout reaches its pool workers
+    too, and turns SIGTERM into SystemExit so shared memory is unlinked
+    """
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    demo = MatrixOptimizationDemo([size], tuner=BlockSizeTuner(cache_file=tuner_cache),
+                                  collect_perf=collect_perf)
+    A, B = demo.generate_matrices(size)
+    label, func, _ = demo.implementations[key]
+    conn.send('started')  # the per-case timeout starts here, after interpreter start-up
+    try:
+        elapsed, result = demo.benchmark_implementation(func, A, B, label, key, repeats)
+    finally:
+        # Pool workers are joined at process exit, before finalizers run
+        demo.close()
+    record = {'impl': key, 'size': size, 'status': 'ok', 'seconds': elapsed,
+              'times': demo.last_times, 'metrics': demo.metrics[key][-1], 'error': None,
+              'tuned_config': None}
+    if size <= verify_limit:
+        reference = np.dot(A, B)
+        record['error'] = float(np.linalg.norm(result - reference) / np.linalg.norm(reference))
+    if key == 'autotuned':
+        config = demo.tuner.configs.get(f"{size}:float64")
+        record['tuned_config'] = config
+    conn.send(record)
+    conn.close()
+
+def load_results(path):
+    """Latest JSON-lines record per (impl, size); later lines win"""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            records[(record['impl'], record['size'])] = record
+    return records
+
+def _append_result(path, record):
+    # One fsync'd line per case, so an interrupted sweep loses at most one case
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def _kill_case(worker, grace=5):
+    """
+    SIGTERM the worker's process group so it can clean up, then SIGKILL
+    whatever is left after `grace` seconds (pool workers hold stdout open)
+    """
+    if not hasattr(os, 'killpg'):
+        worker.terminate()
+        worker.join()
+        return
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(worker.pid, signal.SIGTERM)
+    worker.join(grace)
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(worker.pid, signal.SIGKILL)
+    if worker.is_alive():  # interrupted before it left our process group
+        worker.kill()
+    worker.join()
+
+def _wait_for_case(worker, receiver, timeout):
+    """The case's record, None if it died without one, or 'timeout'"""
+    try:
+        started = receiver.recv() == 'started'
+    except EOFError:
+        started = False
+    if not started:
+        worker.join()
+        return None
+    if not receiver.poll(timeout):
+        return 'timeout'
+    try:
+        record = receiver.recv()
+    except EOFError:  # worker died before reporting
+        record = None
+    worker.join()
+    return record
+
+def run_sweep(sizes, impls, results_path, repeats=1, timeout=None, resume=True,
+              collect_perf=False, ignore_size_limits=False, tuner_cache=None, verify_limit=1024,
+              retry_failed=False):
+    """
+    Run each (impl, size) case in its own process, killing it after
+    `timeout` seconds, and append one JSON record per case to results_path.
+    With resume, cases already recorded are skipped; with retry_failed,
+    cases recorded as a timeout or error are run again, and with
+    ignore_size_limits so are cases skipped for exceeding a size limit
+    """
+    done = load_results(results_path) if resume else {}
+    rerun = set()
+    if retry_failed:
+        rerun |= {'timeout', 'error'}
+    if ignore_size_limits:
+        rerun.add('skipped')
+    done = {case: record for case, record in done.items() if record['status'] not in rerun}
+    limits = {key: max_size for key, (_, _, max_size)
+              in MatrixOptimizationDemo([], tuner=BlockSizeTuner(cache_file=tuner_cache),
+                                        collect_perf=False).implementations.items()}
+    context = mp.get_context('spawn')  # fresh interpreter: no inherited BLAS threads
+    
+    for size in sizes:
+        for key in impls:
+            if (key, size) in done:
+                print(f"Skipping {key} at {size} (already recorded: {done[(key, size)]['status']})")
+                continue
+            if not ignore_size_limits and limits[key] is not None and size > limits[key]:
+                _append_result(results_path, {'impl': key, 'size': size, 'status': 'skipped'})
+                continue
+            
+            receiver, sender = context.Pipe(duplex=False)
+            worker = context.Process(target=_run_case_worker,
+                                     args=(sender, key, size, repeats, collect_perf, tuner_cache, verify_limit))
+            worker.start()
+            sender.close()
+            try:
+                record = _wait_for_case(worker, receiver, timeout)
+            except KeyboardInterrupt:
+                # The case left the terminal's process group, so Ctrl-C did not reach it
+                _kill_case(worker, grace=1)
+                raise
+            if record == 'timeout':
+                _kill_case(worker)
+                record = {'impl': key, 'size': size, 'status': 'timeout', 'timeout': timeout}
+                print(f"{key} at {size} timed out after {timeout}s")
+            if record is None:
+                record = {'impl': key, 'size': size, 'status': 'error', 'exitcode': worker.exitcode}
+            _append_result(results_path, record)
+
+def demo_from_results(path):
+    """Rebuild a MatrixOptimizationDemo's results/metrics from a JSON-lines file for plotting"""
+    records = load_results(path)
+    sizes = sorted({size for _, size in records})
+    demo = MatrixOptimizationDemo(sizes, collect_perf=False)
+    for key in demo.implementations:
+        for size in sizes:
+            record = records.get((key, size), {})
+            ok = record.get('status') == 'ok'
+            demo.results[key].append(record['seconds'] if ok else None)
+            demo.metrics[key].append(record['metrics'] if ok else None)
+            demo.errors[key].append(record.get('error') if ok else None)
+            if ok and record.get('tuned_config'):
+                demo.tuner.configs[f"{size}:float64"] = record["tuned_config"]
+    return demo
+
+def print_summary(report_data):
+    """Print the performance summary tables"""
+    print("\n" + "="*60)
+    print("PERFORMANCE SUMMARY")
+    print("="*60)
+    
+    def fmt(value):
+        return f"{value:.4f}" if value is not None else "N/A"
+    
+    print(f"{'Size':<10} {'Naive (s)':<12} {'Optimized (s)':<15} {'Tiled (s)':<12} {'NumPy (s)':<12} {'Speedup':<10}")
+    print("-" * 75)
+    
+    for i, size in enumerate(report_data['sizes']):
+        naive_time = fmt(report_data['naive_times'][i])
+        opt_time = fmt(report_data['optimized_times'][i])
+        tiled_time = fmt(report_data['tiled_times'][i])
+        numpy_time = fmt(report_data['numpy_times'][i])
+        speedup = report_data['speedups'][i]
+        
+        print(f"{size:<10} {naive_time:<12} {opt_time:<15} {tiled_time:<12} {numpy_time:<12} {speedup:<10}")
+    
+    print(f"\n{'Size':<10} {'Strassen (s)':<14} {'NumPy (s)':<12} {'Strassen/NumPy':<16} {'Rel. Error':<12}")
+    print("-" * 65)
+    for i, size in enumerate(report_data['sizes']):
+        strassen_time = report_data['strassen_times'][i]
+        numpy_time = report_data['numpy_times'][i]
+        error = report_data['errors']['strassen'][i]
+        ratio = f"{strassen_time / numpy_time:.2f}x" if strassen_time and numpy_time else "N/A"
+        error = f"{error:.2e}" if error is not None else "N/A"
+        print(f"{size:<10} {fmt(strassen_time):<14} {fmt(numpy_time):<12} {ratio:<16} {error:<12}")
+    
+    print(f"\n{'Size':<8} {'Implementation':<20} {'GFLOP/s':<10} {'Min BW (GB/s)':<15} "
+          f"{'Peak RSS (MB)':<15} {'Alloc (MB)':<12} {'LLC misses':<12}")
+    print("-" * 95)
+    for key, per_size in report_data['metrics'].items():
+        for size, m in zip(report_data['sizes'], per_size):
+            if m is None:
+                continue
+            llc = (m['perf'] or {}).get('LLC-load-misses')
+            llc = f"{llc:.3e}" if llc is not None else "N/A"
+            traced = m['tracemalloc_peak_mb']
+            traced = f"{traced:.1f}" if traced is not None else "N/A"
+            print(f"{size:<8} {key:<20} {m['gflops']:<10.2f} {m['min_bandwidth_gbs']:<15.3f} "
+                  f"{m['peak_rss_mb']:<15.1f} {traced:<12} {llc:<12}")
+    
+    print(f"\n{'Size':<10} {'Sparse wins SpMV up to':<25} {'Sparse wins SpGEMM up to':<25}")
+    print("-" * 60)
+    for size, crossover in report_data['sparse_crossover'].items():
+        spmv = f"density {crossover['spmv']}" if crossover['spmv'] else "never"
+        spgemm = f"density {crossover['spgemm']}" if crossover['spgemm'] else "never"
+        print(f"{size:<10} {spmv:<25} {spgemm:<25}")
+    
+    print(f"\n{'Storage':<10} {'Accumulate':<12} {'GFLOP/s':<10} {'Total Error':<14} {'Accum. Error':<14}")
+    print("-" * 62)
+    for row in report_data['precision']:
+        print(f"{row['storage']:<10} {row['accumulate']:<12} {row['gflops']:<10.2f} "
+              f"{row['total_error']:<14.2e} {row['accumulation_error']:<14.2e}")
+    
+    print(f"\n{'Dtype':<10} {'Batch':<9} {'Method':<8} {'Matrices/s':<14} {'GFLOP/s':<10}")
+    print("-" * 55)
+    for row in report_data['batched']:
+        print(f"{row['dtype']:<10} {row['batch']:<9} {row['method']:<8} "
+              f"{row['matrices_per_s']:<14.0f} {row['gflops']:<10.2f}")
+    
+    if report_data['scaling']:
+        print(f"\n{'Backend':<12} {'Workers':<9} {'Time (s)':<12} {'Speedup':<10} {'Efficiency':<10}")
+        print("-" * 55)
+        for row in report_data['scaling']:
+            print(f"{row['backend']:<12} {row['workers']:<9} {row['seconds']:<12.4f} "
+                  f"{row['speedup']:<10.2f} {row['efficiency']:<10.0%}")
+    
+
+def main(argv=None):
     """Main execution function"""
+    implementations = list(MatrixOptimizationDemo([], collect_perf=False).implementations)
+    parser = argparse.ArgumentParser(description="HPC matrix multiplication benchmarks")
+    commands = parser.add_subparsers(dest='command')
+    
+    run = commands.add_parser('run', help="headless, resumable sweep writing JSON lines")
+    run.add_argument('--sizes', type=int, nargs='+', default=[100, 200, 300, 500])
+    run.add_argument('--impls', nargs='+', default=None, choices=implementations, metavar='IMPL',
+                     help=f"implementation keys: {', '.join(implementations)} (default: all)")
+    run.add_argument('--repeats', type=int, default=1)
+    run.add_argument('--timeout-per-case', type=float, default=None, help="seconds")
+    run.add_argument('--results', default='hpc_results.jsonl')
+    run.add_argument('--no-resume', action='store_true', help="re-run cases already in the results file")
+    run.add_argument('--retry-failed', action='store_true',
+                     help="re-run cases recorded as a timeout or error")
+    run.add_argument('--perf', action='store_true', help="collect perf stat counters (Linux)")
+    run.add_argument('--ignore-size-limits', action='store_true',
+                     help="run pure-Python implementations above their size limit")
+    run.add_argument('--tuner-cache', default=None)
+    
+    plot = commands.add_parser('plot', help="plot and summarize a results file")
+    plot.add_argument('--results', default='hpc_results.jsonl')
+    plot.add_argument('--output', default='matrix_optimization_results.png')
+    plot.add_argument('--dpi', type=int, default=150)
+    plot.add_argument('--show', action='store_true')
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'run':
+        impls = args.impls or implementations
+        run_sweep(args.sizes, impls, args.results, repeats=args.repeats,
+                  timeout=args.timeout_per_case, resume=not args.no_resume,
+                  collect_perf=args.perf, ignore_size_limits=args.ignore_size_limits,
+                  tuner_cache=args.tuner_cache, retry_failed=args.retry_failed)
+        print(f"\nResults appended to {args.results}")
+        return
+    
+    if args.command == 'plot':
+        if not args.show:
+            plt.switch_backend('Agg')
+        demo = demo_from_results(args.results)
+        demo.visualize_results(output=args.output, dpi=args.dpi, show=args.show)
+        print_summary(demo.generate_report_data())
+        print(f"\nPlot saved to {args.output}")
+        return
+    
     print("HPC Matrix Optimization Demonstration")
     print("=====================================")
     
@@ -245,26 +1566,14 @@ def main():
     # Run benchmarks
     demo.run_comprehensive_benchmark()
     
+    demo.run_sparse_benchmark()
+    demo.run_precision_benchmark()
+    demo.run_batched_benchmark()
+    
     # Generate visualizations
     demo.visualize_results()
     
-    # Print summary results
-    print("\n" + "="*60)
-    print("PERFORMANCE SUMMARY")
-    print("="*60)
-    
-    report_data = demo.generate_report_data()
-    
-    print(f"{'Size':<10} {'Naive (s)':<12} {'Optimized (s)':<15} {'NumPy (s)':<12} {'Speedup':<10}")
-    print("-" * 60)
-    
-    for i, size in enumerate(report_data['sizes']):
-        naive_time = f"{report_data['naive_times'][i]:.4f}" if report_data['naive_times'][i] else "N/A"
-        opt_time = f"{report_data['optimized_times'][i]:.4f}"
-        numpy_time = f"{report_data['numpy_times'][i]:.4f}"
-        speedup = report_data['speedups'][i]
-        
-        print(f"{size:<10} {naive_time:<12} {opt_time:<15} {numpy_time:<12} {speedup:<10}")
+    print_summary(demo.generate_report_data())
     
     print("\nOptimization Benefits:")
     print("- Improved cache locality through blocking/tiling")
@@ -0,0 +1,246 @@
+import heapq
+import pickle
+import random
+import sys
+import time
+from collections import defaultdict
+
+from graph_class import Graph, make_grid_graph
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over a Graph's adj_list. Edge costs include the
+    crowd bias (non-low crowd costs weight * 1.5), so queries return the
+    same safe routes as Graph.dijkstra.
+    """
+    def __init__(self):
+        self.rank = {}  # node -> contraction order (higher = more important)
+        self.up = defaultdict(list)  # u -> [(v, cost)] for edges u->v with rank[v] > rank[u]
+        self.down = defaultdict(list)  # v -> [(u, cost)] for edges u->v with rank[u] > rank[v]
+        self.middle = {}  # (u, w) -> contracted node the shortcut u->w bypasses
+        self.edge_tips = {}  # (u, v) -> tip of the cheapest original edge u->v
+
+    @classmethod
+    def build(cls, graph, settle_limit=60):
+        """
+        Offline preprocessing: contract nodes in order of edge difference
+        (shortcuts added - edges removed + already-contracted neighbours),
+        re-evaluating priorities lazily. settle_limit bounds each witness
+        search; a failed search only adds an unnecessary shortcut.
+        """
+        ch = cls()
+        out = defaultdict(dict)  # u -> {v: cost}, uncontracted part of the graph
+        inn = defaultdict(dict)  # v -> {u: cost}
+        for u, edges in graph.adj_list.items():
+            for v, weight, crowd, tip in edges:
+                if u == v:
+                    continue
+                cost = Graph.effective_weight(weight, crowd)
+                if cost < out[u].get(v, float('inf')):
+                    out[u][v] = cost
+                    inn[v][u] = cost
+                    ch.edge_tips[(u, v)] = tip
+
+        nodes = graph.nodes()
+        deleted_neighbors = defaultdict(int)
+
+        def priority(v):
+            shortcuts = ch._shortcuts(v, out, inn, settle_limit)
+            return len(shortcuts) - len(out[v]) - len(inn[v]) + deleted_neighbors[v], shortcuts
+
+        pq = [(priority(v)[0], i, v) for i, v in enumerate(nodes)]
+        heapq.heapify(pq)
+        order = 0
+        while pq:
+            _, i, v = heapq.heappop(pq)
+            if v in ch.rank:
+                continue
+            # Lazy update: re-queue if the stale priority no longer holds
+            current, shortcuts = priority(v)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, i, v))
+                continue
+
+            for u, w, cost in shortcuts:
+                if cost < out[u].get(w, float('inf')):
+                    out[u][w] = cost
+                    inn[w][u] = cost
+                    ch.middle[(u, w)] = v
+
+            # Every remaining neighbour will be contracted later (ranks higher)
+            ch.rank[v] = order
+            order += 1
+            for w, cost in out.pop(v, {}).items():
+                ch.up[v].append((w, cost))
+                del inn[w][v]
+                deleted_neighbors[w] += 1
+            for u, cost in inn.pop(v, {}).items():
+                ch.down[v].append((u, cost))
+                del out[u][v]
+                deleted_neighbors[u] += 1
+        return ch
+
+    def _shortcuts(self, v, out, inn, settle_limit):
+        """Shortcuts u->w needed when contracting v (no witness path avoiding v)"""
+        shortcuts = []
+        for u, c_uv in inn[v].items():
+            targets = {w: c_uv + c_vw for w, c_vw in out[v].items() if w != u}
+            if not targets:
+                continue
+            dist = self._witness_search(u, v, out, max(targets.values()), settle_limit)
+            for w, cost in targets.items():
+                if dist.get(w, float('inf')) > cost:
+                    shortcuts.append((u, w, cost))
+        return shortcuts
+
+    @staticmethod
+    def _witness_search(source, excluded, out, max_cost, settle_limit):
+        dist = {source: 0}
+        pq = [(0, source)]
+        settled = 0
+        while pq:
+            d, x = heapq.heappop(pq)
+            if d > dist[x]:
+                continue
+            if d > max_cost or settled >= settle_limit:
+                break
+            settled += 1
+            for y, cost in out[x].items():
+                if y == excluded:
+                    continue
+                nd = d + cost
+                if nd < dist.get(y, float('inf')):
+                    dist[y] = nd
+                    heapq.heappush(pq, (nd, y))
+        return dist
+
+    def _upward_search(self, source, edges, stall_edges):
+        """
+        Dijkstra restricted to upward edges, with stall-on-demand: a node
+        reachable more cheaply through a higher-ranked neighbour cannot be on
+        a shortest up-down route, so its edges are not relaxed.
+        """
+        dist = {source: 0}
+        parent = {source: None}
+        pq = [(0, source)]
+        while pq:
+            d, x = heapq.heappop(pq)
+            if d > dist[x]:
+                continue
+            if any(dist.get(y, float('inf')) + cost < d for y, cost in stall_edges.get(x, ())):
+                continue
+            for y, cost in edges.get(x, ()):
+                nd = d + cost
+                if nd < dist.get(y, float('inf')):
+                    dist[y] = nd
+                    parent[y] = x
+                    heapq.heappush(pq, (nd, y))
+        return dist, parent
+
+    def _unpack(self, u, w, path):
+        """Append the original-edge route of (shortcut) edge u->w, excluding u"""
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            m = self.middle.get((a, b))
+            if m is None:
+                path.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+
+    def query(self, start, end, learner_mode=False):
+        """
+        Bidirectional upward search: forward over `up` from start, backward
+        over `down` from end; they meet at the highest-ranked node of the
+        shortest route. Returns (path, tips) like Graph.dijkstra, with tips
+        taken from the original edges along the unpacked path.
+        """
+        if start == end:
+            return [start], []
+        if start not in self.rank or end not in self.rank:
+            return [], []
+        forward, f_parent = self._upward_search(start, self.up, self.down)
+        backward, b_parent = self._upward_search(end, self.down, self.up)
+
+        best, meeting = float('inf'), None
+        for node, d in forward.items():
+            total = d + backward.get(node, float('inf'))
+            if total < best:
+                best, meeting = total, node
+        if meeting is None:
+            return [], []
+
+        hops = []
+        node = meeting
+        while f_parent[node] is not None:
+            hops.append((f_parent[node], node))
+            node = f_parent[node]
+        hops.reverse()
+        node = meeting
+        while b_parent[node] is not None:
+            hops.append((node, b_parent[node]))
+            node = b_parent[node]
+
+        path = [start]
+        for u, w in hops:
+            self._unpack(u, w, path)
+        tips = []
+        if learner_mode:
+            tips = [self.edge_tips[(u, v)] for u, v in zip(path, path[1:]) if self.edge_tips.get((u, v))]
+        return path, tips
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump({'rank': self.rank, 'up': dict(self.up), 'down': dict(self.down),
+                         'middle': self.middle, 'edge_tips': self.edge_tips},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        ch = cls()
+        ch.rank = data['rank']
+        ch.up = defaultdict(list, data['up'])
+        ch.down = defaultdict(list, data['down'])
+        ch.middle = data['middle']
+        ch.edge_tips = data['edge_tips']
+        return ch
+
+def path_cost(graph, path):
+    return sum(min(Graph.effective_weight(w, c) for n, w, c, _ in graph.adj_list[u] if n == v)
+               for u, v in zip(path, path[1:]))
+
+def benchmark(width=100, height=100, queries=200, seed=42):
+    g = make_grid_graph(width, height, seed)
+    print(f"Grid {width}x{height}: {len(g.nodes())} nodes")
+
+    start = time.perf_counter()
+    ch = ContractionHierarchy.build(g)
+    build_time = time.perf_counter() - start
+    shortcuts = len(ch.middle)
+    print(f"Preprocessing: {build_time:.2f}s, {shortcuts} shortcuts")
+
+    rng = random.Random(seed)
+    nodes = list(g.nodes())
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    ch_results = [ch.query(s, t, learner_mode=True) for s, t in pairs]
+    ch_time = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    dijkstra_results = [g.dijkstra(s, t) for s, t in pairs]
+    dijkstra_time = (time.perf_counter() - start) / queries
+
+    for (ch_path, _), (dj_path, _) in zip(ch_results, dijkstra_results):
+        assert abs(path_cost(g, ch_path) - path_cost(g, dj_path)) < 1e-6
+    print(f"Query latency: CH {ch_time * 1e3:.3f} ms vs Dijkstra {dijkstra_time * 1e3:.3f} ms "
+          f"({dijkstra_time / ch_time:.0f}x faster)")
+    return build_time, ch_time, dijkstra_time
+
+# Demo script: python contraction_hierarchy.py [grid side, e.g. 1000 for 10^6 nodes]
+if __name__ == "__main__":
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    benchmark(side, side)
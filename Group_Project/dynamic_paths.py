@@ -0,0 +1,140 @@
+import heapq
+import random
+import sys
+import time
+from collections import defaultdict
+
+from graph_class import make_grid_graph
+
+class DynamicShortestPathTree:
+    """
+    Shortest-path tree from one hot source, kept current as edge costs change
+    (Ramalingam-Reps style). A cheaper edge propagates outward from the node
+    it improves; a dearer tree edge recomputes only the subtree hanging off it.
+    The tree registers itself with the graph, so add_edge and update_crowd
+    repair it automatically.
+    """
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.dist = {}
+        self.parent = {}
+        self.children = defaultdict(set)
+        self.recompute()
+        graph.dynamic_trees.append(self)
+
+    def detach(self):
+        self.graph.dynamic_trees.remove(self)
+
+    def recompute(self):
+        """Full Dijkstra from the source (initial build, or to reset after bulk edits)"""
+        self.dist = {self.source: 0}
+        self.parent = {self.source: None}
+        self.children = defaultdict(set)
+        self._propagate([(0, self.source)])
+
+    def _set_parent(self, node, parent):
+        old = self.parent.get(node)
+        if old is not None:
+            self.children[old].discard(node)
+        self.parent[node] = parent
+        if parent is not None:
+            self.children[parent].add(node)
+
+    def _propagate(self, pq):
+        """Dijkstra continuing from the given (distance, node) seeds"""
+        heapq.heapify(pq)
+        while pq:
+            d, node = heapq.heappop(pq)
+            if d > self.dist.get(node, float('inf')):
+                continue
+            for neighbor, weight, crowd, _ in self.graph.adj_list.get(node, []):
+                distance = d + self.graph.effective_weight(weight, crowd)
+                if distance < self.dist.get(neighbor, float('inf')):
+                    self.dist[neighbor] = distance
+                    self._set_parent(neighbor, node)
+                    heapq.heappush(pq, (distance, neighbor))
+
+    def edge_changed(self, u, v, cost, old_cost=None):
+        """u->v now costs `cost` (cheapest parallel edge); old_cost None means a new edge"""
+        if old_cost is None or cost < old_cost:
+            if u in self.dist and self.dist[u] + cost < self.dist.get(v, float('inf')):
+                self.dist[v] = self.dist[u] + cost
+                self._set_parent(v, u)
+                self._propagate([(self.dist[v], v)])
+            return
+        if self.parent.get(v) != u:
+            return  # the dearer edge was not in the tree, so no distance changes
+
+        # Every node under v lost its distance; the rest of the tree is still exact
+        affected = []
+        stack = [v]
+        while stack:
+            node = stack.pop()
+            affected.append(node)
+            stack.extend(self.children.pop(node, ()))
+        for node in affected:
+            del self.dist[node]
+            self.children[self.parent.pop(node)].discard(node)
+
+        # Re-seed each affected node from its best unaffected predecessor
+        seeds = []
+        for node in affected:
+            best, best_parent = float('inf'), None
+            for pred, weight, crowd, _ in self.graph.rev_adj_list.get(node, []):
+                if pred in self.dist:
+                    candidate = self.dist[pred] + self.graph.effective_weight(weight, crowd)
+                    if candidate < best:
+                        best, best_parent = candidate, pred
+            if best_parent is not None:
+                self.dist[node] = best
+                self._set_parent(node, best_parent)
+                seeds.append((best, node))
+        self._propagate(seeds)
+
+    def path(self, target, learner_mode=False):
+        """Route from the source to target with the tips of its edges"""
+        if target not in self.dist:
+            return [], []
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = self.parent[node]
+        path.reverse()
+        return path, (self.graph._path_tips(path) if learner_mode else [])
+
+def benchmark_dynamic(width=100, height=100, updates=200, seed=42):
+    """Per-update cost of update_crowd + query: dynamic tree repair vs full Dijkstra"""
+    rng = random.Random(seed)
+    source = (0, 0)
+    edges = [(u, v) for u, out in make_grid_graph(width, height, seed).adj_list.items() for v, *_ in out]
+    events = [(*rng.choice(edges), rng.choice(('low', 'medium', 'high')), rng.choice(edges)[1])
+              for _ in range(updates)]
+
+    g = make_grid_graph(width, height, seed)
+    start = time.perf_counter()
+    for u, v, crowd, target in events:
+        g.update_crowd(u, v, crowd)
+        g.dijkstra(source, target)
+    full_time = (time.perf_counter() - start) / updates
+
+    g = make_grid_graph(width, height, seed)
+    tree = DynamicShortestPathTree(g, source)
+    start = time.perf_counter()
+    for u, v, crowd, target in events:
+        g.update_crowd(u, v, crowd)
+        tree.path(target)
+    dynamic_time = (time.perf_counter() - start) / updates
+
+    exact = g._single_source(source)
+    assert all(abs(exact[n] - tree.dist[n]) < 1e-6 for n in exact) and len(exact) == len(tree.dist)
+    print(f"Grid {width}x{height}, {updates} crowd updates from hot source {source}")
+    print(f"Full Dijkstra per update+query: {full_time * 1e3:.3f} ms")
+    print(f"Dynamic tree per update+query:  {dynamic_time * 1e3:.3f} ms ({full_time / dynamic_time:.1f}x)")
+    return full_time, dynamic_time
+
+# Benchmark script: python dynamic_paths.py [grid side]
+if __name__ == "__main__":
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    benchmark_dynamic(side, side)
@@ -1,5 +1,11 @@
-from collections import defaultdict
+from array import array
+import bisect
+from collections import OrderedDict, defaultdict
 import heapq
+import math
+import random
+import sys
+import time
 
 class Graph:
     """
@@ -7,20 +13,81 @@ class Graph:
     """
     def __init__(self):
         self.adj_list = defaultdict(list)  # (neighbor, weight, crowd_level, tip)
-    
+        self.rev_adj_list = defaultdict(list)  # (predecessor, weight, crowd_level, tip)
+        self.coords = {}  # node -> (x, y), for the A* coordinate heuristic
+        self.landmark_from = {}  # landmark -> {node: dist(landmark, node)}
+        self.landmark_to = {}  # landmark -> {node: dist(node, landmark)}
+        self.route_cache = None  # RouteCache, see enable_route_cache
+        self.dynamic_trees = []  # DynamicShortestPathTree objects repaired on edge changes
+
     def add_edge(self, u, v, weight, crowd='low', tip=''):
         if weight < 0:
             raise ValueError("Negative weights not supported")
         self.adj_list[u].append((v, weight, crowd, tip))
-    
+        self.rev_adj_list[v].append((u, weight, crowd, tip))
+        self._notify(u, v, self.effective_weight(weight, crowd))
+
+    def update_crowd(self, u, v, crowd):
+        """Set the crowd level of every u->v edge, then repair caches and dynamic trees"""
+        edges = [e for e in self.adj_list.get(u, []) if e[0] == v]
+        if not edges:
+            raise ValueError(f"No edge {u!r} -> {v!r}")
+        old_cost = min(self.effective_weight(w, c) for _, w, c, _ in edges)
+        self.adj_list[u] = [(n, w, crowd if n == v else c, t) for n, w, c, t in self.adj_list[u]]
+        self.rev_adj_list[v] = [(n, w, crowd if n == u else c, t) for n, w, c, t in self.rev_adj_list[v]]
+        new_cost = min(self.effective_weight(w, crowd) for _, w, _, _ in edges)
+        if new_cost != old_cost:
+            self._notify(u, v, new_cost, old_cost)
+
+    def _notify(self, u, v, cost, old_cost=None):
+        """Tell the route cache and dynamic trees that u->v now costs `cost` (old_cost None = new edge)"""
+        if self.landmark_from and (old_cost is None or cost < old_cost):
+            # A cheaper route can undercut the precomputed distances, making ALT
+            # overestimate; dearer edges keep it a consistent lower bound
+            self.landmark_from, self.landmark_to = {}, {}
+        if self.route_cache is not None:
+            self.route_cache.edge_changed(u, v, cost, old_cost)
+        for tree in self.dynamic_trees:
+            tree.edge_changed(u, v, cost, old_cost)
+
+    @staticmethod
+    def effective_weight(weight, crowd):
+        """Edge cost with the safety bias: non-low crowd costs 50% more"""
+        return weight + (0 if crowd == 'low' else weight * 0.5)
+
+    def nodes(self):
+        return set(self.adj_list) | set(self.rev_adj_list)
+
+    def freeze(self):
+        """Compile into a read-only CSRGraph; later add_edge calls are not reflected"""
+        return CSRGraph(self)
+
     def dijkstra(self, start, end, learner_mode=False):
+        if self.route_cache is None:
+            path, tips, _, _ = self._search(start, end, learner_mode)
+            return path, tips
+        key = (start, end, learner_mode)
+        cached = self.route_cache.get(key)
+        if cached is not None:
+            return cached
+        path, tips, settled, distance = self._search(start, end, learner_mode)
+        self.route_cache.put(key, path, tips, settled, distance)
+        return list(path), list(tips)
+
+    def _search(self, start, end, learner_mode=False):
+        """
+        Dijkstra behind dijkstra(). Also returns the distances of the nodes
+        whose edges were relaxed and the distance of end (inf if unreached),
+        which the route cache needs to decide whether a new edge matters.
+        """
         if start not in self.adj_list and start != end:
-            return [], []
+            return [], [], {start: 0}, float('inf')
 
-        distances = {node: float('inf') for node in self.adj_list}
-        distances[start] = 0
+        # Lazy maps: only nodes the search touches get an entry
+        distances = {start: 0}
         pq = [(0, start)]
-        previous = {node: None for node in self.adj_list}
+        previous = {start: None}
+        settled = {}
         tips = []
 
         while pq:
@@ -29,9 +96,10 @@ class Graph:
                 continue
             if current_node == end:
                 break
+            settled[current_node] = current_distance
             for neighbor, weight, crowd, tip in self.adj_list.get(current_node, []):
-                bias = 0 if crowd == 'low' else weight * 0.5
-                distance = current_distance + weight + bias
+                # Same float sum as effective_weight, so CSRGraph distances match exactly
+                distance = current_distance + (weight + (0 if crowd == 'low' else weight * 0.5))
                 if distance < distances.get(neighbor, float('inf')):
                     distances[neighbor] = distance
                     previous[neighbor] = current_node
@@ -46,4 +114,493 @@ class Graph:
             path.append(current)
             current = previous.get(current)
         path.reverse()
-        return (path if path and path[0] == start else [], tips)
+        found = bool(path) and path[0] == start
+        return (path if found else [], tips, settled,
+                distances.get(end, float('inf')) if found else float('inf'))
+
+    def enable_route_cache(self, maxsize=1024, ttl=None, max_settled=1_000_000):
+        """Cache dijkstra() results; add_edge evicts only routes the new edge could change"""
+        self.route_cache = RouteCache(maxsize, ttl, max_settled)
+        return self.route_cache
+
+    def _path_tips(self, path):
+        """Tips of the edges actually taken (cheapest parallel edge per hop)"""
+        tips = []
+        for u, v in zip(path, path[1:]):
+            edges = [e for e in self.adj_list.get(u, []) if e[0] == v]
+            _, _, _, tip = min(edges, key=lambda e: self.effective_weight(e[1], e[2]))
+            if tip:
+                tips.append(tip)
+        return tips
+
+    def astar(self, start, end, learner_mode=False, heuristic=None):
+        """
+        A* search. heuristic(node, end) must be consistent: h(u) <= cost(u, v) + h(v)
+        for every edge, as nodes are not reopened once settled. Defaults to ALT
+        landmarks if precomputed (dropped when an edge gets cheaper), else
+        coordinates if set, else 0 (plain Dijkstra). Tips are those along the
+        returned path.
+        """
+        if start not in self.adj_list and start != end:
+            return [], []
+        if heuristic is None:
+            if self.landmark_from:
+                heuristic = self.alt_heuristic
+            elif self.coords:
+                heuristic = self.euclidean_heuristic()
+            else:
+                heuristic = lambda node, target: 0
+
+        distances = {start: 0}
+        previous = {start: None}
+        pq = [(heuristic(start, end), 0, start)]
+        settled = set()
+
+        while pq:
+            _, current_distance, current_node = heapq.heappop(pq)
+            if current_node in settled:
+                continue
+            if current_node == end:
+                break
+            settled.add(current_node)
+            for neighbor, weight, crowd, _ in self.adj_list.get(current_node, []):
+                distance = current_distance + self.effective_weight(weight, crowd)
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_node
+                    heapq.heappush(pq, (distance + heuristic(neighbor, end), distance, neighbor))
+
+        if end not in distances:
+            return [], []
+        path = []
+        current = end
+        while current is not None:
+            path.append(current)
+            current = previous[current]
+        path.reverse()
+        return path, (self._path_tips(path) if learner_mode else [])
+
+    def bidirectional_dijkstra(self, start, end, learner_mode=False):
+        """
+        Alternating forward search from start and backward search (over
+        rev_adj_list) from end; stops once the two frontiers' minimum keys
+        add up to at least the best meeting distance found so far.
+        """
+        if start not in self.adj_list and start != end:
+            return [], []
+        if start == end:
+            return [start], []
+
+        dist = ({start: 0}, {end: 0})
+        parent = ({start: None}, {end: None})
+        queues = ([(0, start)], [(0, end)])
+        adjacency = (self.adj_list, self.rev_adj_list)
+        settled = (set(), set())
+        best, meeting = float('inf'), None
+        side = 0
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            d, node = heapq.heappop(queues[side])
+            if node not in settled[side]:
+                settled[side].add(node)
+                for neighbor, weight, crowd, _ in adjacency[side].get(node, []):
+                    distance = d + self.effective_weight(weight, crowd)
+                    if distance < dist[side].get(neighbor, float('inf')):
+                        dist[side][neighbor] = distance
+                        parent[side][neighbor] = node
+                        heapq.heappush(queues[side], (distance, neighbor))
+                    other = dist[1 - side].get(neighbor)
+                    if other is not None and distance + other < best:
+                        best, meeting = distance + other, neighbor
+            side = 1 - side
+
+        if meeting is None:
+            return [], []
+        path = []
+        current = meeting
+        while current is not None:
+            path.append(current)
+            current = parent[0][current]
+        path.reverse()
+        current = parent[1][meeting]
+        while current is not None:
+            path.append(current)
+            current = parent[1][current]
+        return path, (self._path_tips(path) if learner_mode else [])
+
+    def set_coordinates(self, node, x, y):
+        self.coords[node] = (x, y)
+
+    def euclidean_heuristic(self, scale=1.0):
+        """
+        Straight-line distance times `scale`; consistent when every edge's
+        biased cost is at least scale * the distance between its endpoints.
+        """
+        def heuristic(node, target):
+            if node not in self.coords or target not in self.coords:
+                return 0
+            (x1, y1), (x2, y2) = self.coords[node], self.coords[target]
+            return scale * math.hypot(x1 - x2, y1 - y2)
+        return heuristic
+
+    def _single_source(self, source, reverse=False):
+        """Full Dijkstra over biased costs, forward or on the reversed graph"""
+        adjacency = self.rev_adj_list if reverse else self.adj_list
+        distances = {source: 0}
+        pq = [(0, source)]
+        while pq:
+            d, node = heapq.heappop(pq)
+            if d > distances[node]:
+                continue
+            for neighbor, weight, crowd, _ in adjacency.get(node, []):
+                distance = d + self.effective_weight(weight, crowd)
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    heapq.heappush(pq, (distance, neighbor))
+        return distances
+
+    def precompute_landmarks(self, count=4, landmarks=None):
+        """
+        Offline ALT preprocessing: distances to and from each landmark.
+        Landmarks are picked greedily, each farthest from those chosen so far.
+        Adding an edge or lowering a crowd level clears the tables; call again.
+        """
+        self.landmark_from, self.landmark_to = {}, {}
+        if landmarks is None:
+            nodes = self.nodes()
+            if not nodes:
+                return []
+            landmarks = [next(iter(nodes))]
+            reach = dict(self._single_source(landmarks[0]))
+            while len(landmarks) < min(count, len(nodes)):
+                candidates = [n for n in reach if n not in landmarks]
+                if not candidates:
+                    break
+                landmarks.append(max(candidates, key=reach.get))
+                for node, d in self._single_source(landmarks[-1]).items():
+                    reach[node] = min(reach.get(node, d), d)
+        for landmark in landmarks:
+            self.landmark_from[landmark] = self._single_source(landmark)
+            self.landmark_to[landmark] = self._single_source(landmark, reverse=True)
+        return landmarks
+
+    def alt_heuristic(self, node, target):
+        """Triangle-inequality lower bound on dist(node, target) over all landmarks"""
+        best = 0
+        for landmark, from_l in self.landmark_from.items():
+            to_l = self.landmark_to[landmark]
+            if node in from_l and target in from_l:
+                best = max(best, from_l[target] - from_l[node])
+            if node in to_l and target in to_l:
+                best = max(best, to_l[node] - to_l[target])
+        return best
+
+class RouteCache:
+    """
+    LRU cache of dijkstra() results keyed on (start, end, learner_mode), with
+    an optional TTL in seconds. Each entry keeps the distances of the nodes
+    its search settled, so an edge change only evicts the routes it can affect.
+    Those maps are O(V) each, so besides maxsize entries the cache holds at
+    most max_settled settled nodes in total (None = no limit).
+    """
+    def __init__(self, maxsize=1024, ttl=None, max_settled=1_000_000):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_settled = max_settled
+        self.entries = OrderedDict()  # key -> (path, tips, settled, distance, created)
+        self.settled_total = 0  # sum of len(settled) over entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # dropped for capacity
+        self.expirations = 0  # dropped for TTL
+        self.invalidations = 0  # dropped because an edge changed
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self.ttl is not None and time.monotonic() - entry[4] > self.ttl:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(entry[0]), list(entry[1])
+
+    def put(self, key, path, tips, settled, distance):
+        if key in self.entries:
+            self._remove(key)
+        if self.max_settled is not None and len(settled) > self.max_settled:
+            self.evictions += 1  # would displace the whole cache; not worth keeping
+            return
+        self.entries[key] = (path, tips, settled, distance, time.monotonic())
+        self.settled_total += len(settled)
+        while len(self.entries) > self.maxsize or (self.max_settled is not None
+                                                   and self.settled_total > self.max_settled):
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        self.settled_total -= len(self.entries.pop(key)[2])
+
+    def edge_changed(self, u, v, cost, old_cost=None):
+        """
+        Evict routes affected by edge u->v now costing `cost` (old_cost None
+        for a new edge). A cheaper edge matters only if its tail u was settled
+        and d(u) + cost can match or beat both the cached distance and v's settled
+        distance. A dearer edge matters only to routes that traverse u->v.
+        Learner-mode tips record every relaxation, so those entries are
+        evicted whenever u was settled.
+        """
+        stale = []
+        for key, (path, _, settled, distance, _) in self.entries.items():
+            learner_mode = key[2]
+            if old_cost is not None and cost > old_cost:
+                affected = any(a == u and b == v for a, b in zip(path, path[1:]))
+            else:
+                affected = u in settled and settled[u] + cost <= settled.get(v, distance)
+            if learner_mode and u in settled:
+                affected = True
+            if affected:
+                stale.append(key)
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        self.entries.clear()
+        self.settled_total = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self.entries), 'settled': self.settled_total,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions, 'expirations': self.expirations,
+                'invalidations': self.invalidations}
+
+class CSRGraph:
+    """
+    Compact read-only form of a Graph. Nodes are interned to ids 0..n-1 and
+    edges stored in CSR arrays: out-edges of node i are
+    targets[offsets[i]:offsets[i + 1]], with the crowd bias already folded
+    into float64 weights, so the arrays cost 12 bytes per edge (int32 target
+    + float64 weight) plus 4 per node for offsets. Tips live in a side table
+    keyed by edge index.
+    """
+    def __init__(self, graph):
+        nodes = list(dict.fromkeys(list(graph.adj_list) + list(graph.rev_adj_list)))
+        # Ids in label order, so heap ties on (distance, id) break as Graph's
+        # ties on (distance, label) do; unorderable labels keep insertion order
+        try:
+            nodes.sort()
+        except TypeError:
+            pass
+        self.id_nodes = nodes
+        self.node_ids = {node: i for i, node in enumerate(self.id_nodes)}
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.weights = array('d')
+        self.tips = {}  # edge index -> tip
+        for node in self.id_nodes:
+            for neighbor, weight, crowd, tip in graph.adj_list.get(node, []):
+                if tip:
+                    self.tips[len(self.targets)] = tip
+                self.targets.append(self.node_ids[neighbor])
+                self.weights.append(Graph.effective_weight(weight, crowd))
+            self.offsets.append(len(self.targets))
+
+    def __len__(self):
+        return len(self.id_nodes)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        """Arrays plus the interning and tip tables (node labels themselves excluded)"""
+        arrays = sum(a.buffer_info()[1] * a.itemsize for a in (self.offsets, self.targets, self.weights))
+        return (arrays + sys.getsizeof(self.id_nodes) + sys.getsizeof(self.node_ids)
+                + sys.getsizeof(self.tips))
+
+    def dijkstra(self, start, end, learner_mode=False):
+        """
+        Graph.dijkstra over the CSR arrays: same path and tips, including on
+        equal-cost ties, provided node labels are mutually orderable
+        """
+        if start == end:
+            return [start], []
+        s = self.node_ids.get(start)
+        if s is None or self.offsets[s] == self.offsets[s + 1]:
+            return [], []
+        t = self.node_ids.get(end, -1)
+
+        offsets, targets, weights, edge_tips = self.offsets, self.targets, self.weights, self.tips
+        distances = {s: 0.0}
+        previous = {s: -1}
+        pq = [(0.0, s)]
+        tips = []
+
+        while pq:
+            current_distance, u = heapq.heappop(pq)
+            if current_distance > distances[u]:
+                continue
+            if u == t:
+                break
+            lo, hi = offsets[u], offsets[u + 1]
+            for e, v, weight in zip(range(lo, hi), targets[lo:hi], weights[lo:hi]):
+                distance = current_distance + weight
+                if distance < distances.get(v, float('inf')):
+                    distances[v] = distance
+                    previous[v] = u
+                    heapq.heappush(pq, (distance, v))
+                    if learner_mode and e in edge_tips:
+                        tips.append(edge_tips[e])
+
+        if t not in previous:
+            return [], tips
+        path = []
+        current = t
+        while current != -1:
+            path.append(self.id_nodes[current])
+            current = previous[current]
+        path.reverse()
+        return path, tips
+
+    def shortest_path_tree(self, source, targets=None):
+        """
+        Single-source Dijkstra from node id `source`. Stops once every id in
+        `targets` is settled (or runs to completion if None). Returns
+        distances and the edge index used to reach each node.
+        """
+        offsets, targets_arr, weights = self.offsets, self.targets, self.weights
+        remaining = set(targets) if targets is not None else None
+        distances = {source: 0.0}
+        previous_edge = {source: -1}
+        pq = [(0.0, source)]
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > distances[u]:
+                continue
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            lo, hi = offsets[u], offsets[u + 1]
+            for e, v, weight in zip(range(lo, hi), targets_arr[lo:hi], weights[lo:hi]):
+                distance = d + weight
+                if distance < distances.get(v, float('inf')):
+                    distances[v] = distance
+                    previous_edge[v] = e
+                    heapq.heappush(pq, (distance, v))
+        return distances, previous_edge
+
+    def edge_source(self, e):
+        """Node id owning edge index e (binary search over offsets)"""
+        return bisect.bisect_right(self.offsets, e) - 1
+
+def make_grid_graph(width, height, seed=42):
+    """Synthetic road grid: two-way streets, random lengths and crowd levels, a few tips"""
+    rng = random.Random(seed)
+    g = Graph()
+    for x in range(width):
+        for y in range(height):
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < width and ny < height:
+                    for u, v in (((x, y), (nx, ny)), ((nx, ny), (x, y))):
+                        crowd = rng.choice(('low', 'low', 'medium', 'high'))
+                        tip = 'Check mirrors at junction' if rng.random() < 0.01 else ''
+                        g.add_edge(u, v, rng.uniform(1, 10), crowd, tip)
+    return g
+
+def adjacency_bytes(graph):
+    """Deep size of adj_list + rev_adj_list; shared objects (strings, node labels) counted once"""
+    seen = set()
+    total = 0
+    for adjacency in (graph.adj_list, graph.rev_adj_list):
+        total += sys.getsizeof(adjacency)
+        for edges in adjacency.values():
+            total += sys.getsizeof(edges)
+            for edge in edges:
+                total += sys.getsizeof(edge)
+                for field in edge[1:]:
+                    if id(field) not in seen:
+                        seen.add(id(field))
+                        total += sys.getsizeof(field)
+    return total
+
+def benchmark_freeze(width=100, height=100, queries=500, seed=42):
+    g = make_grid_graph(width, height, seed)
+    edges = sum(len(e) for e in g.adj_list.values())
+    start = time.perf_counter()
+    csr = g.freeze()
+    freeze_time = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    nodes = list(g.nodes())
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    for s, t in pairs:
+        g.dijkstra(s, t, learner_mode=True)
+    dict_qps = queries / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for s, t in pairs:
+        csr.dijkstra(s, t, learner_mode=True)
+    csr_qps = queries / (time.perf_counter() - start)
+
+    print(f"Grid {width}x{height}: {len(csr)} nodes, {edges} edges (frozen in {freeze_time:.2f}s)")
+    print(f"{'Storage':<12} {'Bytes/edge':>12} {'Queries/sec':>12}")
+    print(f"{'adj_list':<12} {adjacency_bytes(g) / edges:>12.1f} {dict_qps:>12.1f}")
+    print(f"{'CSR':<12} {csr.nbytes / edges:>12.1f} {csr_qps:>12.1f}")
+    array_bytes = sum(a.itemsize * len(a) for a in (csr.offsets, csr.targets, csr.weights))
+    print(f"CSR arrays: {array_bytes / edges:.1f} bytes/edge (int32 target + float64 weight "
+          f"+ int32 offsets); the rest is the node-id and tip tables")
+    return dict_qps, csr_qps
+
+def benchmark_route_cache(width=50, height=50, queries=2000, popular=200, update_every=50, seed=42):
+    """
+    Repeated popular pairs (Zipf-like) with a random road added every
+    `update_every` queries: uncached vs cached time, plus cache metrics.
+    """
+    rng = random.Random(seed)
+    nodes = list(make_grid_graph(width, height, seed).nodes())
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(popular)]
+    weights = [1 / (rank + 1) for rank in range(popular)]
+    stream = rng.choices(pairs, weights, k=queries)
+    updates = [(rng.choice(nodes), rng.choice(nodes), rng.uniform(1, 10)) for _ in range(queries // update_every)]
+
+    timings = {}
+    for cached in (False, True):
+        g = make_grid_graph(width, height, seed)
+        if cached:
+            g.enable_route_cache(maxsize=popular // 2)
+        start = time.perf_counter()
+        for i, (s, t) in enumerate(stream):
+            if i % update_every == update_every - 1:
+                g.add_edge(*updates[i // update_every])
+            g.dijkstra(s, t)
+        timings[cached] = time.perf_counter() - start
+
+    stats = g.route_cache.stats()
+    print(f"Route cache: {queries} queries over {popular} popular pairs, {len(updates)} add_edge calls")
+    print(f"Uncached {timings[False]:.2f}s, cached {timings[True]:.2f}s ({timings[False] / timings[True]:.1f}x)")
+    print("Hit rate {hit_rate:.1%}, evictions {evictions}, expirations {expirations}, "
+          "invalidations {invalidations}, settled nodes held {settled}".format(**stats))
+    return timings, stats
+
+# Benchmark script: python graph_class.py [grid side]
+if __name__ == "__main__":
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    benchmark_freeze(side, side)
+    print()
+    benchmark_route_cache()
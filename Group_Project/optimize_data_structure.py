@@ -1,31 +1,202 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import heapq
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
 import matplotlib.pyplot as plt
+import numpy as np
+import scipy.sparse as sp
 
 # Recommendation engine with scoring and plotting
 class RecommendationEngine:
     def __init__(self):
-        self.user_profiles = {}  # User ID -> set of product IDs
-        self.product_graph = defaultdict(dict)  # Product ID -> {related_product: weight}
+        self.user_profiles = {}  # User ID -> set of product IDs (incremental, since the last batch build)
+        self.product_graph = defaultdict(dict)  # Product ID -> {related_product: weight} (same window)
+        # Interned ids shared by the incremental dicts and the batch CSR state
+        self.user_ids = {}  # User ID -> row
+        self.users = []  # row -> User ID
+        self.product_ids = {}  # Product ID -> column
+        self.products = []  # column -> Product ID
+        self.user_items = sp.csr_matrix((0, 0), dtype=bool)  # users x products, True = interacted
+        self.cooccurrence = sp.csr_matrix((0, 0), dtype=np.int32)  # products x products, diagonal removed
+        # Top-N neighbour index (see build_neighbor_index); None until built
+        self.index_offsets = None  # column -> start in index_neighbors, len = indexed products + 1
+        self.index_neighbors = None  # neighbour columns, by descending weight within each product
+        self.index_weights = None
+        self.index_top_n = 0
+        self.index_overlay = {}  # column -> (neighbours, weights) rebuilt by refresh_neighbor_index
+        self.dirty_products = set()  # columns whose neighbours changed since the index was built/refreshed
+        self.delta_log = None  # open append-only interaction log, see load_snapshot(log=True)
+
+    def _intern(self, value, table, names):
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(names)
+            names.append(value)
+        return code
+
+    def _intern_array(self, values, table, names):
+        """Vectorized interning: one dict lookup per distinct id, not per interaction"""
+        uniques, inverse = np.unique(np.asarray(values), return_inverse=True)
+        codes = np.array([self._intern(value, table, names) for value in uniques.tolist()], dtype=np.int64)
+        return codes[inverse.ravel()]
 
     def add_interaction(self, user_id, product_id):
+        if self.delta_log is not None:
+            self.delta_log.write(json.dumps([user_id, product_id]) + "\n")
+        self._intern(user_id, self.user_ids, self.users)
+        self._intern(product_id, self.product_ids, self.products)
+        seen = self._seen(user_id)
         if user_id not in self.user_profiles:
             self.user_profiles[user_id] = set()
-        for other_product in self.user_profiles[user_id]:
+        for other_product in seen:
             if other_product != product_id:
                 self.product_graph[product_id][other_product] = self.product_graph[product_id].get(other_product, 0) + 1
                 self.product_graph[other_product][product_id] = self.product_graph[other_product].get(product_id, 0) + 1
         self.user_profiles[user_id].add(product_id)
+        if self.index_offsets is not None:
+            self.dirty_products.add(self.product_ids[product_id])
+            self.dirty_products.update(self.product_ids[p] for p in seen)
+
+    def add_interactions(self, users, products):
+        """
+        Batch ingestion of an interaction log given as parallel arrays of user
+        and product ids. Rebuilds user_items (X) and cooccurrence = XᵀX with the
+        diagonal removed from everything seen so far, folding in (and clearing)
+        the incremental dicts. A repeated (user, product) pair counts once.
+        Any neighbour index is dropped; call build_neighbor_index again.
+        """
+        if self.delta_log is not None:
+            for user_id, product_id in zip(np.asarray(users).tolist(), np.asarray(products).tolist()):
+                self.delta_log.write(json.dumps([user_id, product_id]) + "\n")
+        rows = [self._intern_array(users, self.user_ids, self.users)]
+        cols = [self._intern_array(products, self.product_ids, self.products)]
+        if self.user_profiles:
+            pairs = [(self.user_ids[u], self.product_ids[p]) for u, items in self.user_profiles.items() for p in items]
+            rows.append(np.array([u for u, _ in pairs], dtype=np.int64))
+            cols.append(np.array([p for _, p in pairs], dtype=np.int64))
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+
+        shape = (len(self.users), len(self.products))
+        new = sp.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=shape)
+        old = self.user_items
+        old.resize(shape)
+        self.user_items = (old + new).tocsr()
+        self.user_items.sort_indices()
+
+        X = self.user_items.astype(np.int32)
+        C = (X.T @ X).tocsr()
+        C.setdiag(0)
+        C.eliminate_zeros()
+        C.sort_indices()
+        self.cooccurrence = C
+        self.user_profiles = {}
+        self.product_graph = defaultdict(dict)
+        self.index_offsets = self.index_neighbors = self.index_weights = None
+        self.index_overlay = {}
+        self.dirty_products = set()
+
+    def _seen_columns(self, user_id):
+        seen = {self.product_ids[p] for p in self.user_profiles.get(user_id, ())}
+        row = self.user_ids.get(user_id)
+        if row is not None and row < self.user_items.shape[0]:
+            indptr = self.user_items.indptr
+            seen.update(self.user_items.indices[indptr[row]:indptr[row + 1]].tolist())
+        return seen
+
+    def _seen(self, user_id):
+        return {self.products[col] for col in self._seen_columns(user_id)}
+
+    def _neighbors(self, product):
+        """Co-occurrence weights of product: batch CSR row plus incremental counts"""
+        neighbors = {}
+        col = self.product_ids.get(product)
+        if col is not None and col < self.cooccurrence.shape[0]:
+            C = self.cooccurrence
+            lo, hi = C.indptr[col], C.indptr[col + 1]
+            neighbors = dict(zip([self.products[j] for j in C.indices[lo:hi].tolist()], C.data[lo:hi].tolist()))
+        for neighbor, weight in self.product_graph.get(product, {}).items():
+            neighbors[neighbor] = neighbors.get(neighbor, 0) + weight
+        return neighbors
+
+    def _top_neighbors(self, col, top_n):
+        """Neighbour columns and weights of one product, heaviest first, truncated to top_n"""
+        product = self.products[col]
+        C = self.cooccurrence
+        if not self.product_graph.get(product):
+            if col >= C.shape[0]:
+                return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+            lo, hi = C.indptr[col], C.indptr[col + 1]
+            cols, weights = C.indices[lo:hi], C.data[lo:hi]
+            if len(weights) > top_n:
+                keep = np.argpartition(-weights, top_n)[:top_n]
+                cols, weights = cols[keep], weights[keep]
+            order = np.argsort(-weights, kind='stable')
+            return cols[order].astype(np.int32), weights[order].astype(np.int32)
+        best = heapq.nlargest(top_n, self._neighbors(product).items(), key=lambda item: item[1])
+        return (np.array([self.product_ids[p] for p, _ in best], dtype=np.int32),
+                np.array([w for _, w in best], dtype=np.int32))
+
+    def build_neighbor_index(self, top_n=50):
+        """
+        Offline index of every product's top_n neighbours by weight, stored as
+        CSR-style arrays. While it exists, recommend() merges only these
+        truncated lists; products touched by add_interaction are picked up by
+        refresh_neighbor_index().
+        """
+        lists = [self._top_neighbors(col, top_n) for col in range(len(self.products))]
+        self.index_offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(cols) for cols, _ in lists], out=self.index_offsets[1:])
+        self.index_neighbors = np.concatenate([cols for cols, _ in lists] or [np.empty(0, dtype=np.int32)])
+        self.index_weights = np.concatenate([w for _, w in lists] or [np.empty(0, dtype=np.int32)])
+        self.index_top_n = top_n
+        self.index_overlay = {}
+        self.dirty_products = set()
+
+    def refresh_neighbor_index(self):
+        """Rebuild the neighbour lists of products touched since the last build/refresh"""
+        for col in self.dirty_products:
+            self.index_overlay[col] = self._top_neighbors(col, self.index_top_n)
+        refreshed = len(self.dirty_products)
+        self.dirty_products = set()
+        return refreshed
+
+    def _indexed_neighbors(self, col):
+        if col in self.index_overlay:
+            return self.index_overlay[col]
+        if col + 1 < len(self.index_offsets):
+            lo, hi = self.index_offsets[col], self.index_offsets[col + 1]
+            return self.index_neighbors[lo:hi], self.index_weights[lo:hi]
+        return self.index_neighbors[:0], self.index_weights[:0]
+
+    def _recommend_indexed(self, user_id, top_n):
+        seen = self._seen_columns(user_id)
+        scores = defaultdict(int)
+        for col in seen:
+            cols, weights = self._indexed_neighbors(col)
+            for neighbor, weight in zip(cols.tolist(), weights.tolist()):
+                if neighbor not in seen:
+                    scores[neighbor] += weight
+        best = heapq.nlargest(top_n, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [self.products[col] for col, _ in best]
 
     def recommend(self, user_id, top_n=5):
-        if user_id not in self.user_profiles:
+        if user_id not in self.user_ids:
             return []
+        if self.index_offsets is not None:
+            return self._recommend_indexed(user_id, top_n)
 
-        seen = self.user_profiles[user_id]
+        seen = self._seen(user_id)
         scores = defaultdict(int)
 
         for product in seen:
-            for neighbor, weight in self.product_graph[product].items():
+            for neighbor, weight in self._neighbors(product).items():
                 if neighbor not in seen:
                     scores[neighbor] += weight
 
@@ -33,37 +204,665 @@ class RecommendationEngine:
         heapq.heapify(heap)
         return [heapq.heappop(heap)[1] for _ in range(min(top_n, len(heap)))]
 
-# Simulate interactions
-engine = RecommendationEngine()
-interactions = [
-    ("user1", "A"), ("user1", "B"),
-    ("user2", "B"), ("user2", "C"), ("user2", "D"),
-    ("user3", "A"), ("user3", "C"), ("user3", "E"),
-    ("user4", "B"), ("user4", "E"), ("user4", "F"),
-    ("user5", "C"), ("user5", "D"), ("user5", "F"),
-]
-
-# Track recommendations for plotting
-recommendation_counts = {}
-
-for user, product in interactions:
-    engine.add_interaction(user, product)
-
-# Generate recommendations and count them
-for user_id in engine.user_profiles:
-    recs = engine.recommend(user_id, top_n=3)
-    for rec in recs:
-        recommendation_counts[rec] = recommendation_counts.get(rec, 0) + 1
-
-# Plotting recommendations frequency
-products = list(recommendation_counts.keys())
-counts = [recommendation_counts[product] for product in products]
-
-plt.figure(figsize=(10, 6))
-plt.bar(products, counts, color='skyblue')
-plt.title("Frequency of Product Recommendations")
-plt.xlabel("Product")
-plt.ylabel("Times Recommended")
-plt.grid(axis='y')
-plt.tight_layout()
-plt.show()
+    def _scoring_matrix(self):
+        """products x products weights recommend() scores with: batch CSR plus incremental counts"""
+        n = len(self.products)
+        C = self.cooccurrence.copy()
+        C.resize((n, n))
+        if self.product_graph:
+            rows, cols, data = [], [], []
+            for product, neighbors in self.product_graph.items():
+                for other, weight in neighbors.items():
+                    rows.append(self.product_ids[product])
+                    cols.append(self.product_ids[other])
+                    data.append(weight)
+            C = C + sp.csr_matrix((np.array(data, dtype=np.int32), (rows, cols)), shape=(n, n))
+        return C.tocsr()
+
+    def _user_matrix(self, rows):
+        """Binary matrix of the given users' seen products (batch and incremental)"""
+        indptr, indices = [0], []
+        for row in rows:
+            indices.extend(self._seen_columns(self.users[row]))
+            indptr.append(len(indices))
+        return sp.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr),
+                             shape=(len(indptr) - 1, len(self.products)))
+
+    def _recommend_rows(self, rows, top_n, scoring=None):
+        """(user, recommendations) for user rows; scoring given = vectorized U @ C path"""
+        if scoring is None:
+            return [(self.users[row], self.recommend(self.users[row], top_n)) for row in rows]
+        U = self._user_matrix(rows)
+        S = (U @ scoring).tocsr()
+        S = (S - S.multiply(U > 0)).tocsr()
+        S.eliminate_zeros()
+        results = []
+        for i, row in enumerate(rows):
+            lo, hi = S.indptr[i], S.indptr[i + 1]
+            cols, scores = S.indices[lo:hi], S.data[lo:hi]
+            if len(scores) > top_n:
+                keep = np.argpartition(-scores, top_n)[:top_n]
+                cols, scores = cols[keep], scores[keep]
+            order = np.lexsort((cols, -scores))
+            results.append((self.users[row], [self.products[col] for col in cols[order].tolist()]))
+        return results
+
+    def recommend_all(self, output, top_n=3, workers=1, chunk_size=10_000, vectorized=False):
+        """
+        Recommendations for every known user, streamed to `output` as lines
+        "user<TAB>product,product,...". Users are sharded into chunks of
+        chunk_size across `workers` processes, which inherit the engine via
+        fork; lines arrive in completion order. vectorized=True scores each
+        chunk as a sparse product of its user rows and the full co-occurrence
+        matrix (bypassing any top-N neighbour index). Returns users written.
+        """
+        scoring = self._scoring_matrix() if vectorized else None
+        chunks = [range(i, min(i + chunk_size, len(self.users))) for i in range(0, len(self.users), chunk_size)]
+        written = 0
+        with open(output, 'w') as f:
+            if workers == 1:
+                for chunk in chunks:
+                    written += _write_recommendations(f, self._recommend_rows(chunk, top_n, scoring))
+            else:
+                context = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                         initializer=_init_worker, initargs=(self, scoring)) as pool:
+                    futures = [pool.submit(_recommend_chunk, chunk, top_n) for chunk in chunks]
+                    for future in as_completed(futures):
+                        written += _write_recommendations(f, future.result())
+        return written
+
+    def save_snapshot(self, directory):
+        """
+        Write the engine to `directory` as .npy arrays (CSR parts of user_items
+        and cooccurrence, plus the neighbour index if built) and JSON id tables.
+        Pending incremental interactions are folded into the matrices first,
+        and the delta log in `directory` is truncated: the snapshot covers it.
+        Saving over the snapshot an engine was loaded from is safe. Ids must be
+        JSON-serializable.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._prepare_snapshot()
+        if self.dirty_products:
+            self.refresh_neighbor_index()
+        if self.index_overlay:
+            self.build_neighbor_index(self.index_top_n)
+
+        arrays = self._snapshot_arrays()
+        if self.index_offsets is not None:
+            for part in ('offsets', 'neighbors', 'weights'):
+                arrays[f"index_{part}"] = getattr(self, f"index_{part}")
+        meta = {'version': 1, 'engine': type(self).__name__, 'users': len(self.users),
+                'products': len(self.products),
+                'index_top_n': self.index_top_n if self.index_offsets is not None else 0}
+        meta.update(self._snapshot_meta())
+
+        # Everything goes to .tmp files first and is renamed into place: arrays
+        # loaded with mmap=True may map the very files being replaced, and a
+        # rename leaves those mappings on the old contents
+        written = []
+        for name, values in arrays.items():
+            path = os.path.join(directory, f"{name}.npy")
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, values)
+            written.append(path)
+        path = os.path.join(directory, 'ids.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'users': self.users, 'products': self.products}, f)
+        written.append(path)
+        meta_path = os.path.join(directory, 'meta.json')
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+
+        # meta.json last: a snapshot without it is incomplete
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        for path in written:
+            os.replace(path + '.tmp', path)
+        open(os.path.join(directory, 'delta.log'), 'w').close()
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def _prepare_snapshot(self):
+        """Fold incremental interactions into the batch matrices"""
+        if self.user_profiles:
+            top_n = self.index_top_n if self.index_offsets is not None else 0
+            log, self.delta_log = self.delta_log, None
+            self.add_interactions([], [])
+            self.delta_log = log
+            if top_n:
+                self.build_neighbor_index(top_n)
+
+    def _snapshot_arrays(self):
+        return {f"{name}_{part}": getattr(getattr(self, name), part)
+                for name in ('user_items', 'cooccurrence') for part in ('data', 'indices', 'indptr')}
+
+    def _snapshot_meta(self):
+        return {'user_items_shape': self.user_items.shape, 'cooccurrence_shape': self.cooccurrence.shape}
+
+    @classmethod
+    def _from_snapshot_meta(cls, meta):
+        return cls()
+
+    def _restore_snapshot(self, meta, load):
+        for name in ('user_items', 'cooccurrence'):
+            parts = [load(f"{name}_{part}") for part in ('data', 'indices', 'indptr')]
+            setattr(self, name, sp.csr_matrix(tuple(parts), shape=tuple(meta[f"{name}_shape"]), copy=False))
+
+    @classmethod
+    def load_snapshot(cls, directory, mmap=True, log=False):
+        """
+        Open a snapshot. With mmap=True the arrays are memory-mapped read-only,
+        so startup is near-instant and serving processes share the pages.
+        Interactions in delta.log are replayed through add_interaction. With
+        log=True, later interactions are appended to delta.log (one writer).
+        """
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        kind = meta.get('engine', 'RecommendationEngine')
+        if kind != cls.__name__:
+            raise ValueError(f"Snapshot in {directory} is a {kind}, not a {cls.__name__}")
+        engine = cls._from_snapshot_meta(meta)
+        with open(os.path.join(directory, 'ids.json')) as f:
+            ids = json.load(f)
+        engine.users, engine.products = ids['users'], ids['products']
+        engine.user_ids = {user: row for row, user in enumerate(engine.users)}
+        engine.product_ids = {product: col for col, product in enumerate(engine.products)}
+
+        mode = 'r' if mmap else None
+        load = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+        engine._restore_snapshot(meta, load)
+        if meta['index_top_n']:
+            engine.index_offsets, engine.index_neighbors, engine.index_weights = (
+                load(f"index_{part}") for part in ('offsets', 'neighbors', 'weights'))
+            engine.index_top_n = meta['index_top_n']
+
+        log_path = os.path.join(directory, 'delta.log')
+        if os.path.exists(log_path):
+            with open(log_path) as f:
+                for line in f:
+                    if line.strip():
+                        engine.add_interaction(*json.loads(line))
+        if log:
+            engine.delta_log = open(log_path, 'a', buffering=1)
+        return engine
+
+    @property
+    def nbytes(self):
+        """Bytes held by the batch CSR arrays"""
+        return sum(a.nbytes for m in (self.user_items, self.cooccurrence) for a in (m.data, m.indices, m.indptr))
+
+class CountMinSketch:
+    """depth x width counter table; estimates never undercount"""
+    def __init__(self, width, depth=4, seed=0):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int32)
+        self.salts = [random.Random(seed + row).getrandbits(32) for row in range(depth)]
+
+    def _cells(self, key):
+        return [hash((salt, key)) % self.width for salt in self.salts]
+
+    def add(self, key, count=1):
+        for row, col in enumerate(self._cells(key)):
+            self.table[row, col] += count
+
+    def estimate(self, key):
+        return min(int(self.table[row, col]) for row, col in enumerate(self._cells(key)))
+
+class SpaceSaving:
+    """
+    Heavy-hitters summary monitoring at most `capacity` keys. A new key
+    replaces the current minimum and inherits its count + 1, so counts are
+    upper bounds and every key more frequent than total/capacity is kept.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.heap = []  # (count, key), lazily updated
+
+    def offer(self, key, count=1):
+        """Count key; returns the key it evicted, if any"""
+        evicted = None
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+        else:
+            while True:
+                minimum, candidate = heapq.heappop(self.heap)
+                if self.counts.get(candidate) == minimum:
+                    break
+                if candidate in self.counts:
+                    heapq.heappush(self.heap, (self.counts[candidate], candidate))
+            del self.counts[candidate]
+            evicted = candidate
+            self.counts[key] = minimum + count
+        heapq.heappush(self.heap, (self.counts[key], key))
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(c, k) for k, c in self.counts.items()]
+            heapq.heapify(self.heap)
+        return evicted
+
+class BoundedRecommendationEngine(RecommendationEngine):
+    """
+    Incremental engine with bounded memory. Each user keeps a reservoir of at
+    most max_items_per_user products, and only sampled products create pairs.
+    Pair counts live either in product_graph ('exact', pruned below min_count
+    every prune_every interactions or when over budget) or in a CountMinSketch
+    plus SpaceSaving summary ('sketch') sized from memory_budget. The budget
+    covers the pair store, the part that grows quadratically in items per user.
+    Snapshots hold the reservoirs, pair store and RNG state, so a loaded
+    engine replaying delta.log samples exactly as the writer did.
+    """
+    BYTES_PER_PAIR = 100  # measured dict-of-dicts cost per directed co-occurrence
+    BYTES_PER_HEAVY_HITTER = 250  # SpaceSaving dict + heap entries + neighbour set slots
+
+    def __init__(self, max_items_per_user=50, min_count=2, prune_every=100_000,
+                 pair_store='exact', memory_budget=64 * 2**20, seed=42):
+        super().__init__()
+        if pair_store not in ('exact', 'sketch'):
+            raise ValueError("pair_store must be 'exact' or 'sketch'")
+        self.max_items_per_user = max_items_per_user
+        self.min_count = min_count
+        self.prune_every = prune_every
+        self.pair_store = pair_store
+        self.memory_budget = memory_budget
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.user_counts = {}  # User ID -> distinct products offered to the reservoir
+        self.interactions = 0
+        self.pair_entries = 0  # directed entries in product_graph
+        if pair_store == 'sketch':
+            depth = 4
+            self.sketch = CountMinSketch(max(1, memory_budget // 2 // (depth * 4)), depth, seed)
+            self.heavy_pairs = SpaceSaving(max(1, memory_budget // 2 // self.BYTES_PER_HEAVY_HITTER))
+            self.pair_neighbors = defaultdict(set)  # column -> columns paired with it in heavy_pairs
+
+    def add_interaction(self, user_id, product_id):
+        if self.delta_log is not None:
+            self.delta_log.write(json.dumps([user_id, product_id]) + "\n")
+        self._intern(user_id, self.user_ids, self.users)
+        self._intern(product_id, self.product_ids, self.products)
+        profile = self.user_profiles.setdefault(user_id, set())
+        if product_id not in profile:
+            n = self.user_counts[user_id] = self.user_counts.get(user_id, 0) + 1
+            if len(profile) >= self.max_items_per_user:
+                # Reservoir sampling: keep the new product with probability k/n.
+                # Sorted, not set order, so a delta-log replay picks the same victim
+                if self.rng.randrange(n) >= self.max_items_per_user:
+                    return
+                profile.remove(self.rng.choice(sorted(profile)))
+        for other_product in profile:
+            if other_product != product_id:
+                self._count_pair(product_id, other_product)
+        if self.index_offsets is not None:
+            self.dirty_products.add(self.product_ids[product_id])
+            self.dirty_products.update(self.product_ids[p] for p in profile)
+        profile.add(product_id)
+
+        self.interactions += 1
+        if self.pair_store == 'exact' and (self.interactions % self.prune_every == 0
+                                           or self.approx_bytes() > self.memory_budget):
+            self.prune()
+
+    def add_interactions(self, users, products):
+        """Batch logs go through the same sampled, bounded path"""
+        for user_id, product_id in zip(np.asarray(users).tolist(), np.asarray(products).tolist()):
+            self.add_interaction(user_id, product_id)
+
+    def _count_pair(self, a, b):
+        if self.pair_store == 'exact':
+            for x, y in ((a, b), (b, a)):
+                neighbors = self.product_graph[x]
+                if y not in neighbors:
+                    self.pair_entries += 1
+                neighbors[y] = neighbors.get(y, 0) + 1
+            return
+        ca, cb = self.product_ids[a], self.product_ids[b]
+        key = (ca, cb) if ca < cb else (cb, ca)
+        self.sketch.add(key)
+        is_new = key not in self.heavy_pairs.counts
+        evicted = self.heavy_pairs.offer(key)
+        if evicted is not None:
+            self.pair_neighbors[evicted[0]].discard(evicted[1])
+            self.pair_neighbors[evicted[1]].discard(evicted[0])
+        if is_new:
+            self.pair_neighbors[ca].add(cb)
+            self.pair_neighbors[cb].add(ca)
+
+    def prune(self):
+        """
+        Sweep product_graph, dropping pairs below min_count. While still over
+        half the memory budget, double the threshold and sweep again; the
+        headroom keeps budget-triggered sweeps from running every interaction.
+        """
+        threshold = self.min_count
+        removed = 0
+        while True:
+            for product in list(self.product_graph):
+                neighbors = self.product_graph[product]
+                weak = [other for other, count in neighbors.items() if count < threshold]
+                for other in weak:
+                    del neighbors[other]
+                removed += len(weak)
+                if not neighbors:
+                    del self.product_graph[product]
+            self.pair_entries = sum(len(neighbors) for neighbors in self.product_graph.values())
+            if self.approx_bytes() <= self.memory_budget // 2 or not self.pair_entries:
+                return removed
+            threshold *= 2
+
+    def _neighbors(self, product):
+        if self.pair_store == 'exact':
+            return dict(self.product_graph.get(product, {}))
+        col = self.product_ids.get(product)
+        neighbors = {}
+        for other in self.pair_neighbors.get(col, ()):
+            key = (col, other) if col < other else (other, col)
+            neighbors[self.products[other]] = min(self.heavy_pairs.counts[key], self.sketch.estimate(key))
+        return neighbors
+
+    def _top_neighbors(self, col, top_n):
+        best = heapq.nlargest(top_n, self._neighbors(self.products[col]).items(), key=lambda item: item[1])
+        return (np.array([self.product_ids[p] for p, _ in best], dtype=np.int32),
+                np.array([w for _, w in best], dtype=np.int32))
+
+    def _prepare_snapshot(self):
+        pass  # user_profiles are the reservoirs, not pending batch input
+
+    def _snapshot_arrays(self):
+        """Reservoirs as (row, column) pairs, and the pair store as (a, b, count) rows"""
+        pairs = [(self.user_ids[user], self.product_ids[product])
+                 for user, profile in self.user_profiles.items() for product in profile]
+        arrays = {'reservoirs': np.array(pairs, dtype=np.int64).reshape(-1, 2),
+                  'user_counts': np.array([self.user_counts.get(user, 0) for user in self.users], dtype=np.int64)}
+        if self.pair_store == 'exact':
+            counts = [(self.product_ids[a], self.product_ids[b], count)
+                      for a, neighbors in self.product_graph.items() for b, count in neighbors.items()]
+            arrays['pair_counts'] = np.array(counts, dtype=np.int64).reshape(-1, 3)
+        else:
+            arrays['sketch_table'] = self.sketch.table
+            arrays['heavy_pairs'] = np.array([(a, b, count) for (a, b), count in self.heavy_pairs.counts.items()],
+                                             dtype=np.int64).reshape(-1, 3)
+        return arrays
+
+    def _snapshot_meta(self):
+        version, state, gauss = self.rng.getstate()
+        return {'config': {'max_items_per_user': self.max_items_per_user, 'min_count': self.min_count,
+                           'prune_every': self.prune_every, 'pair_store': self.pair_store,
+                           'memory_budget': self.memory_budget, 'seed': self.seed},
+                'interactions': self.interactions, 'rng_state': [version, list(state), gauss]}
+
+    @classmethod
+    def _from_snapshot_meta(cls, meta):
+        return cls(**meta['config'])
+
+    def _restore_snapshot(self, meta, load):
+        # Copies, not read-only maps: every part of the bounded state is mutable
+        for row, col in load('reservoirs').tolist():
+            self.user_profiles.setdefault(self.users[row], set()).add(self.products[col])
+        self.user_counts = {user: count for user, count in zip(self.users, load('user_counts').tolist()) if count}
+        self.interactions = meta['interactions']
+        version, state, gauss = meta['rng_state']
+        self.rng.setstate((version, tuple(state), gauss))
+        if self.pair_store == 'exact':
+            for a, b, count in load('pair_counts').tolist():
+                self.product_graph[self.products[a]][self.products[b]] = count
+            self.pair_entries = sum(len(neighbors) for neighbors in self.product_graph.values())
+            return
+        self.sketch.table = np.array(load('sketch_table'))
+        for a, b, count in load('heavy_pairs').tolist():
+            self.heavy_pairs.counts[(a, b)] = count
+            self.pair_neighbors[a].add(b)
+            self.pair_neighbors[b].add(a)
+        self.heavy_pairs.heap = [(count, key) for key, count in self.heavy_pairs.counts.items()]
+        heapq.heapify(self.heavy_pairs.heap)
+
+    def _scoring_matrix(self):
+        n = len(self.products)
+        rows, cols, data = [], [], []
+        for col, product in enumerate(self.products):
+            for other, weight in self._neighbors(product).items():
+                rows.append(col)
+                cols.append(self.product_ids[other])
+                data.append(weight)
+        return sp.csr_matrix((np.array(data, dtype=np.int32), (rows, cols)), shape=(n, n))
+
+    def approx_bytes(self):
+        """Estimated bytes of the pair store (reservoirs are already capped per user)"""
+        if self.pair_store == 'exact':
+            return self.pair_entries * self.BYTES_PER_PAIR
+        return self.sketch.table.nbytes + len(self.heavy_pairs.counts) * self.BYTES_PER_HEAVY_HITTER
+
+# Engine and scoring matrix for recommend_all pool workers; with fork they are inherited, not pickled
+_ENGINE = None
+_SCORING = None
+
+def _init_worker(engine, scoring):
+    global _ENGINE, _SCORING
+    _ENGINE, _SCORING = engine, scoring
+
+def _recommend_chunk(rows, top_n):
+    return _ENGINE._recommend_rows(rows, top_n, _SCORING)
+
+def _write_recommendations(f, results):
+    for user, recs in results:
+        f.write(f"{user}\t{','.join(map(str, recs))}\n")
+    return len(results)
+
+def synthetic_interactions(n_interactions, n_users, n_products, seed=42, skew=1.5):
+    """Uniform users, Zipf-skewed product popularity"""
+    rng = np.random.default_rng(seed)
+    users = rng.integers(0, n_users, n_interactions)
+    products = (rng.zipf(skew, n_interactions) - 1) % n_products
+    return users, products
+
+def benchmark_ingest(n_interactions=10_000_000, n_users=2_000_000, n_products=100_000, dict_sample=200_000):
+    """Batch CSR ingest vs add_interaction loop: time and bytes per co-occurrence"""
+    users, products = synthetic_interactions(n_interactions, n_users, n_products)
+
+    tracemalloc.start()
+    engine = RecommendationEngine()
+    start = time.perf_counter()
+    engine.add_interactions(users, products)
+    batch_time = time.perf_counter() - start
+    _, batch_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nnz = engine.cooccurrence.nnz
+    csr_bytes = engine.cooccurrence.data.nbytes + engine.cooccurrence.indices.nbytes
+
+    # The dict path is far slower, so time a prefix of the log and extrapolate
+    sample_users, sample_products = users[:dict_sample].tolist(), products[:dict_sample].tolist()
+    dict_engine = RecommendationEngine()
+    start = time.perf_counter()
+    for user, product in zip(sample_users, sample_products):
+        dict_engine.add_interaction(user, product)
+    dict_time = time.perf_counter() - start
+    graph = dict_engine.product_graph
+    dict_bytes = sys.getsizeof(graph) + sum(sys.getsizeof(neighbors) for neighbors in graph.values())
+    dict_pairs = sum(len(neighbors) for neighbors in graph.values())
+
+    print(f"{n_interactions:,} interactions, {n_users:,} users, {n_products:,} products")
+    print(f"Batch CSR ingest: {batch_time:.2f}s, peak {batch_peak / 2**20:.0f} MiB, "
+          f"{nnz:,} co-occurrences ({csr_bytes / max(nnz, 1):.1f} B/co-occurrence)")
+    print(f"add_interaction loop: {dict_time:.2f}s for {dict_sample:,} "
+          f"(~{dict_time * n_interactions / dict_sample:.0f}s extrapolated), "
+          f"{dict_bytes / max(dict_pairs, 1):.1f} B/co-occurrence")
+    return batch_time, dict_time
+
+def benchmark_recommend_latency(n_interactions=1_000_000, n_users=200_000, n_products=20_000,
+                                queries=2000, top_n=50, updates=5000, seed=42):
+    """p50/p99 recommend() latency: full neighbour scan vs the top-N index"""
+    users, products = synthetic_interactions(n_interactions, n_users, n_products, seed)
+    engine = RecommendationEngine()
+    engine.add_interactions(users, products)
+    rng = np.random.default_rng(seed)
+    sample = [engine.users[row] for row in rng.choice(len(engine.users), queries, replace=False).tolist()]
+
+    def latencies():
+        times = []
+        for user in sample:
+            start = time.perf_counter()
+            engine.recommend(user, top_n=5)
+            times.append(time.perf_counter() - start)
+        return np.percentile(times, [50, 99]) * 1e3
+
+    exact = latencies()
+    exact_recs = {user: engine.recommend(user, top_n=5) for user in sample}
+    start = time.perf_counter()
+    engine.build_neighbor_index(top_n)
+    build_time = time.perf_counter() - start
+    indexed = latencies()
+    agreement = np.mean([len(set(exact_recs[u]) & set(engine.recommend(u, top_n=5))) / max(len(exact_recs[u]), 1)
+                         for u in sample])
+
+    new_users, new_products = synthetic_interactions(updates, n_users, n_products, seed + 1)
+    for user, product in zip(new_users.tolist(), new_products.tolist()):
+        engine.add_interaction(user, product)
+    start = time.perf_counter()
+    refreshed = engine.refresh_neighbor_index()
+    refresh_time = time.perf_counter() - start
+
+    print(f"{n_interactions:,} interactions, {len(sample)} recommend() calls, top-{top_n} index")
+    print(f"{'Method':<14} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    print(f"{'full scan':<14} {exact[0]:>10.3f} {exact[1]:>10.3f}")
+    print(f"{'top-N index':<14} {indexed[0]:>10.3f} {indexed[1]:>10.3f}")
+    print(f"Index build {build_time:.2f}s; top-5 agreement with full scan {agreement:.1%}")
+    print(f"Refresh after {updates} add_interaction calls: {refreshed} products in {refresh_time:.2f}s")
+    return exact, indexed
+
+def recall_at_k(engine, reference, users, k=5):
+    """Mean fraction of reference's top-k recommendations that engine also returns"""
+    recalls = []
+    for user in users:
+        expected = reference.recommend(user, top_n=k)
+        if expected:
+            recalls.append(len(set(expected) & set(engine.recommend(user, top_n=k))) / len(expected))
+    return float(np.mean(recalls)) if recalls else 0.0
+
+def benchmark_bounded(n_interactions=300_000, n_users=10_000, n_products=2_000, budgets=(0.25, 1, 4),
+                      max_items_per_user=50, k=5, sample=1000, seed=42):
+    """Pair-store memory and recall@k of the bounded engines against the exact engine"""
+    users, products = synthetic_interactions(n_interactions, n_users, n_products, seed, skew=1.1)
+    log = list(zip(users.tolist(), products.tolist()))
+    exact = RecommendationEngine()
+    for user, product in log:
+        exact.add_interaction(user, product)
+    exact_bytes = sum(len(neighbors) for neighbors in exact.product_graph.values()) * \
+        BoundedRecommendationEngine.BYTES_PER_PAIR
+    sample_users = random.Random(seed).sample(list(exact.user_profiles), min(sample, len(exact.user_profiles)))
+
+    print(f"{n_interactions:,} interactions; exact pair store ~{exact_bytes / 2**20:.1f} MiB")
+    print(f"{'Store':<8} {'Budget MiB':>10} {'Used MiB':>9} {'Time (s)':>9} {f'Recall@{k}':>9}")
+    for pair_store in ('exact', 'sketch'):
+        for budget in budgets:
+            engine = BoundedRecommendationEngine(max_items_per_user, pair_store=pair_store,
+                                                 memory_budget=int(budget * 2**20), seed=seed)
+            start = time.perf_counter()
+            for user, product in log:
+                engine.add_interaction(user, product)
+            elapsed = time.perf_counter() - start
+            recall = recall_at_k(engine, exact, sample_users, k)
+            print(f"{pair_store:<8} {budget:>10} {engine.approx_bytes() / 2**20:>9.2f} {elapsed:>9.2f} {recall:>9.1%}")
+
+def benchmark_recommend_all(n_interactions=100_000, n_users=20_000, n_products=20_000, worker_counts=None, seed=42):
+    """Users/sec of recommend_all: per-user recommend() vs vectorized scoring, over worker counts"""
+    users, products = synthetic_interactions(n_interactions, n_users, n_products, seed)
+    engine = RecommendationEngine()
+    engine.add_interactions(users, products)
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, cpus} | {w for w in (4, 8) if w <= cpus})
+
+    print(f"recommend_all for {len(engine.users):,} users, {os.cpu_count()} CPUs")
+    print(f"{'Scoring':<12} {'Workers':>8} {'Users/sec':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'recommendations.tsv')
+        for vectorized in (False, True):
+            for workers in worker_counts:
+                start = time.perf_counter()
+                written = engine.recommend_all(output, top_n=3, workers=workers, vectorized=vectorized)
+                rate = written / (time.perf_counter() - start)
+                print(f"{'U @ C' if vectorized else 'recommend()':<12} {workers:>8} {rate:>12,.0f}")
+
+def benchmark_snapshot(n_interactions=2_000_000, n_users=400_000, n_products=50_000, deltas=10_000, seed=42):
+    """Startup time: rebuild from the interaction log vs loading a snapshot (copied or mmap), plus delta replay"""
+    users, products = synthetic_interactions(n_interactions, n_users, n_products, seed)
+    start = time.perf_counter()
+    engine = RecommendationEngine()
+    engine.add_interactions(users, products)
+    engine.build_neighbor_index()
+    rebuild_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        engine.save_snapshot(directory)
+        save_time = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        print(f"Snapshot of {n_interactions:,} interactions: {size / 2**20:.1f} MiB, saved in {save_time:.2f}s")
+        print(f"{'Startup':<22} {'Time (s)':>9}")
+        print(f"{'rebuild from log':<22} {rebuild_time:>9.3f}")
+        for label, mmap in (('load (copy)', False), ('load (mmap)', True)):
+            start = time.perf_counter()
+            loaded = RecommendationEngine.load_snapshot(directory, mmap=mmap)
+            loaded.recommend(loaded.users[0])
+            print(f"{label:<22} {time.perf_counter() - start:>9.3f}")
+
+        writer = RecommendationEngine.load_snapshot(directory, log=True)
+        new_users, new_products = synthetic_interactions(deltas, n_users, n_products, seed + 1)
+        for user, product in zip(new_users.tolist(), new_products.tolist()):
+            writer.add_interaction(user, product)
+        writer.delta_log.close()
+        start = time.perf_counter()
+        RecommendationEngine.load_snapshot(directory)
+        print(f"{f'mmap + {deltas:,} deltas':<22} {time.perf_counter() - start:>9.3f}")
+
+# Demo script: python optimize_data_structure.py [--benchmark [interactions]]
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark_ingest(int(float(sys.argv[2])) if len(sys.argv) > 2 else 10_000_000)
+        print()
+        benchmark_recommend_latency()
+        print()
+        benchmark_bounded()
+        print()
+        benchmark_recommend_all()
+        print()
+        benchmark_snapshot()
+        sys.exit()
+
+    # Simulate interactions
+    engine = RecommendationEngine()
+    interactions = [
+        ("user1", "A"), ("user1", "B"),
+        ("user2", "B"), ("user2", "C"), ("user2", "D"),
+        ("user3", "A"), ("user3", "C"), ("user3", "E"),
+        ("user4", "B"), ("user4", "E"), ("user4", "F"),
+        ("user5", "C"), ("user5", "D"), ("user5", "F"),
+    ]
+
+    # Track recommendations for plotting
+    recommendation_counts = {}
+
+    for user, product in interactions:
+        engine.add_interaction(user, product)
+
+    # Generate recommendations and count them
+    for user_id in engine.user_profiles:
+        recs = engine.recommend(user_id, top_n=3)
+        for rec in recs:
+            recommendation_counts[rec] = recommendation_counts.get(rec, 0) + 1
+
+    # Plotting recommendations frequency
+    products = list(recommendation_counts.keys())
+    counts = [recommendation_counts[product] for product in products]
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(products, counts, color='skyblue')
+    plt.title("Frequency of Product Recommendations")
+    plt.xlabel("Product")
+    plt.ylabel("Times Recommended")
+    plt.grid(axis='y')
+    plt.tight_layout()
+    plt.show()
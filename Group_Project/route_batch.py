@@ -0,0 +1,119 @@
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from graph_class import Graph, make_grid_graph
+
+# Read-only CSRGraph for pool workers; with fork it is inherited, not pickled
+_GRAPH = None
+
+def _init_worker(graph):
+    global _GRAPH
+    _GRAPH = graph
+
+def route_from_tree(graph, previous_edge, source_id, target_id, learner_mode=False):
+    """Path (node labels) and tips of the path edges from a shortest_path_tree result"""
+    if target_id not in previous_edge:
+        return [], []
+    edges = []
+    node = target_id
+    while node != source_id:
+        e = previous_edge[node]
+        edges.append(e)
+        node = graph.edge_source(e)
+    edges.reverse()
+    path = [graph.id_nodes[source_id]] + [graph.id_nodes[graph.targets[e]] for e in edges]
+    tips = [graph.tips[e] for e in edges if e in graph.tips] if learner_mode else []
+    return path, tips
+
+def answer_group(graph, source, queries, learner_mode=False):
+    """
+    Answer every (index, end) in `queries` from one single-source run that
+    stops once all requested targets are settled.
+    """
+    source_id = graph.node_ids.get(source)
+    results = []
+    if source_id is None:
+        for index, end in queries:
+            results.append((index, [source] if end == source else [], []))
+        return results
+    target_ids = {graph.node_ids[end] for _, end in queries if end in graph.node_ids}
+    _, previous_edge = graph.shortest_path_tree(source_id, target_ids)
+    for index, end in queries:
+        end_id = graph.node_ids.get(end)
+        if end_id is None:
+            results.append((index, [], []))
+        else:
+            results.append((index,) + route_from_tree(graph, previous_edge, source_id, end_id, learner_mode))
+    return results
+
+def _answer_groups(groups, learner_mode):
+    results = []
+    for source, queries in groups:
+        results.extend(answer_group(_GRAPH, source, queries, learner_mode))
+    return results
+
+def batch_routes(graph, queries, learner_mode=False, workers=1, sources_per_task=8):
+    """
+    Yield (index, path, tips) for each (start, end) in `queries` as results
+    complete, in no particular order. Queries are grouped by start, and groups
+    are sent to a process pool in chunks of `sources_per_task`. Tips are those
+    of the returned path's edges.
+    """
+    csr = graph.freeze() if isinstance(graph, Graph) else graph
+    by_source = defaultdict(list)
+    for index, (start, end) in enumerate(queries):
+        by_source[start].append((index, end))
+    groups = list(by_source.items())
+
+    if workers == 1:
+        for source, group in groups:
+            yield from answer_group(csr, source, group, learner_mode)
+        return
+
+    context = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+    chunks = [groups[i:i + sources_per_task] for i in range(0, len(groups), sources_per_task)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(csr,)) as pool:
+        futures = [pool.submit(_answer_groups, chunk, learner_mode) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+def benchmark_batch(width=100, height=100, queries=5000, sources=100, seed=42, worker_counts=None):
+    """Queries/sec of per-pair Graph.dijkstra vs batch_routes at increasing worker counts"""
+    g = make_grid_graph(width, height, seed)
+    csr = g.freeze()
+    rng = random.Random(seed)
+    nodes = list(g.nodes())
+    hubs = [rng.choice(nodes) for _ in range(sources)]
+    pairs = [(rng.choice(hubs), rng.choice(nodes)) for _ in range(queries)]
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, cpus} | {w for w in (8, 16) if w <= cpus})
+
+    print(f"Grid {width}x{height}, {queries} queries from {sources} sources, {os.cpu_count()} CPUs")
+    sample = pairs[:max(1, queries // 10)]
+    start = time.perf_counter()
+    for s, t in sample:
+        g.dijkstra(s, t)
+    baseline = len(sample) / (time.perf_counter() - start)
+    print(f"{'Method':<22} {'Queries/sec':>12} {'Speedup':>8}")
+    print(f"{'Graph.dijkstra':<22} {baseline:>12.1f} {1.0:>8.2f}")
+
+    scaling = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        answered = sum(1 for _ in batch_routes(csr, pairs, workers=workers))
+        qps = answered / (time.perf_counter() - start)
+        scaling[workers] = qps
+        print(f"{'batch, ' + str(workers) + ' workers':<22} {qps:>12.1f} {qps / baseline:>8.2f}")
+    return baseline, scaling
+
+# Benchmark script: python route_batch.py [grid side]
+if __name__ == "__main__":
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    benchmark_batch(side, side)
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from contraction_hierarchy import ContractionHierarchy, path_cost
+from graph_class import Graph
+from test_graph_class import random_graph
+
+@pytest.mark.parametrize('seed', range(10))
+def test_query_matches_dijkstra(seed):
+    g = random_graph(random.Random(seed), nodes=30, edges=90, integer_weights=False)
+    ch = ContractionHierarchy.build(g)
+    for start in range(32):  # 30, 31 are not in the graph
+        for end in range(32):
+            path, _ = ch.query(start, end)
+            expected, _ = g.dijkstra(start, end)
+            assert bool(path) == bool(expected)
+            if path:
+                assert (path[0], path[-1]) == (start, end)
+                assert path_cost(g, path) == pytest.approx(path_cost(g, expected))
+
+def test_query_same_node_matches_dijkstra():
+    g = Graph()
+    g.add_edge('a', 'b', 1)
+    ch = ContractionHierarchy.build(g)
+    for node in ('a', 'b', 'unknown'):
+        assert ch.query(node, node) == g.dijkstra(node, node) == ([node], [])
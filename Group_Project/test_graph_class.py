@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from graph_class import Graph, make_grid_graph
+
+def random_graph(rng, nodes, edges, integer_weights):
+    g = Graph()
+    for _ in range(edges):
+        u, v = rng.randrange(nodes), rng.randrange(nodes)
+        weight = rng.randint(1, 4) if integer_weights else rng.uniform(0.1, 10.0)
+        crowd = rng.choice(['low', 'low', 'medium', 'high'])
+        tip = f"tip {u}->{v}" if rng.random() < 0.3 else ''
+        g.add_edge(u, v, weight, crowd, tip)
+    return g
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('integer_weights', [True, False], ids=['ties', 'float'])
+def test_csr_dijkstra_matches_graph(seed, integer_weights):
+    rng = random.Random(seed)
+    g = random_graph(rng, nodes=30, edges=90, integer_weights=integer_weights)
+    csr = g.freeze()
+    for start in range(32):  # 30, 31 are not in the graph
+        for end in range(32):
+            for learner_mode in (False, True):
+                assert csr.dijkstra(start, end, learner_mode) == g.dijkstra(start, end, learner_mode)
+
+def test_csr_dijkstra_matches_graph_on_grid():
+    g = make_grid_graph(12, 12, seed=7)
+    csr = g.freeze()
+    rng = random.Random(7)
+    nodes = sorted(g.nodes())
+    for _ in range(200):
+        start, end = rng.choice(nodes), rng.choice(nodes)
+        assert csr.dijkstra(start, end, True) == g.dijkstra(start, end, True)
+
+def path_cost(g, path):
+    return sum(min(Graph.effective_weight(w, c) for n, w, c, _ in g.adj_list[u] if n == v)
+               for u, v in zip(path, path[1:]))
+
+@pytest.mark.parametrize('seed', range(10))
+def test_astar_optimal_after_edges_get_cheaper(seed):
+    rng = random.Random(seed)
+    g = random_graph(rng, nodes=30, edges=90, integer_weights=False)
+    g.precompute_landmarks(3)
+    g.add_edge(rng.randrange(30), rng.randrange(30), 0.01)
+    u, (v, *_) = next((u, e) for u, edges in g.adj_list.items() for e in edges if e[2] != 'low')
+    g.update_crowd(u, v, 'low')
+    for start in range(30):
+        for end in range(30):
+            path, _ = g.astar(start, end)
+            expected, _ = g.dijkstra(start, end)
+            assert bool(path) == bool(expected)
+            assert path_cost(g, path) == pytest.approx(path_cost(g, expected))